@@ -0,0 +1,57 @@
+"""
+Store page parsing throughput: each adapter's `parse` over its recorded
+fixture page, plus an eBay listing with hundreds of offers, in pages per
+second.
+
+    python -m benchmarks.bench_adapters
+"""
+from benchmarks.common import SHORT_RUN_TIME, SHORT_RUN_TOLERANCE, best_time, throughput
+from src.adapters import ADAPTERS
+from src.fixture_server import FIXTURE_FILES, load_fixture
+
+FIXTURE_ISBN = "9788478884452"
+
+# Offers in the synthetic marketplace listing
+LISTING_OFFERS = 500
+
+
+def long_listing(html, offers=LISTING_OFFERS):
+    """The eBay fixture with its offers repeated until the page lists `offers` of them."""
+    start, end = html.index('<li class="s-item'), html.rindex('</li>') + len('</li>')
+    items = html[start:end].split('</li>')[:-1]
+    repeated = ''.join(items[i % len(items)] + '</li>' for i in range(offers))
+    return html[:start] + repeated + html[end:]
+
+
+def run(pages=50, repeat=3):
+    """Return the parse throughput of every store adapter, in pages/second."""
+    results = {}
+    for store_name, fixture in FIXTURE_FILES.items():
+        adapter = ADAPTERS[store_name]()
+        html = load_fixture(fixture).decode("utf-8")
+        if adapter.parse(html, FIXTURE_ISBN) is None:
+            raise RuntimeError(f"The {store_name} adapter no longer matches its fixture")
+
+        def parse_pages():
+            for _ in range(pages):
+                adapter.parse(html, FIXTURE_ISBN)
+
+        best = best_time(parse_pages, min_time=SHORT_RUN_TIME, min_repeat=repeat)
+        results[f"parse.{fixture}"] = throughput(pages / best, "pages/s", SHORT_RUN_TOLERANCE)
+
+    adapter = ADAPTERS["eBay"]()
+    listing = long_listing(load_fixture(FIXTURE_FILES["eBay"]).decode("utf-8"))
+    if adapter.parse(listing, FIXTURE_ISBN)["offer_count"] != LISTING_OFFERS:
+        raise RuntimeError("The eBay adapter doesn't read every offer of a long listing")
+    best = best_time(lambda: adapter.parse(listing, FIXTURE_ISBN), min_time=SHORT_RUN_TIME, min_repeat=repeat)
+    results[f"parse.ebay_{LISTING_OFFERS}_offers"] = throughput(1 / best, "pages/s", SHORT_RUN_TOLERANCE)
+    return results
+
+
+def main():
+    for name, result in run().items():
+        print(f"{name:>22}: {result['value']:>10,.0f} {result['unit']}")
+
+
+if __name__ == "__main__":
+    main()
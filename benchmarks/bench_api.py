@@ -0,0 +1,62 @@
+"""
+JSON API against the fixture server: latency of a cached single-ISBN
+request over a keep-alive connection, and throughput of a batch of cached
+ISBNs streamed back as NDJSON. Both measure the API's own overhead; store
+lookups are timed by the search suite.
+
+    python -m benchmarks.bench_api
+"""
+import requests
+
+from benchmarks.common import (SHORT_RUN_TIME, SHORT_RUN_TOLERANCE, best_time, latency, offline_environment,
+                               throughput)
+
+# Not the search suite's ISBN, whose cold lookups must not find it cached
+ISBN = "9788498387087"
+
+# Requests per warm-lookup sample
+WARM_CALLS = 100
+
+# ISBNs per batch request
+BATCH_SIZE = 200
+
+
+def run(warm_repeat=5, batch_repeat=3):
+    offline_environment()
+    from src.api import start_api_server
+
+    server, base_url = start_api_server()
+    session = requests.Session()
+    try:
+        session.get(f"{base_url}/isbn/{ISBN}").raise_for_status()
+
+        def warm_lookups():
+            for _ in range(WARM_CALLS):
+                session.get(f"{base_url}/isbn/{ISBN}").content
+
+        # Cold batches would mostly measure the stores' rate limits
+        body = "\n".join([ISBN] * BATCH_SIZE)
+
+        def batch():
+            lines = session.post(f"{base_url}/batch", data=body).iter_lines()
+            assert sum(1 for _ in lines) == BATCH_SIZE
+
+        warm = best_time(warm_lookups, min_time=SHORT_RUN_TIME, min_repeat=warm_repeat) / WARM_CALLS
+        best = best_time(batch, min_time=SHORT_RUN_TIME, min_repeat=batch_repeat)
+        return {
+            "api.isbn_warm": latency([warm], tolerance=SHORT_RUN_TOLERANCE),
+            "api.batch": throughput(BATCH_SIZE / best, "isbn/s", SHORT_RUN_TOLERANCE),
+        }
+    finally:
+        session.close()
+        server.shutdown()
+        server.server_close()
+
+
+def main():
+    for name, result in run().items():
+        print(f"{name:>18}: {result['value']:>12,.1f} {result['unit']}")
+
+
+if __name__ == "__main__":
+    main()
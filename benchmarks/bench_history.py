@@ -0,0 +1,55 @@
+"""
+Price history: append throughput, and how long the trend view takes to read
+its aggregates out of a history of a million rows.
+
+    python -m benchmarks.bench_history
+"""
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.common import latency, throughput, timings
+from src.history import PriceHistory
+from src.stores import STORE_URLS
+
+ISBN = "9788478884452"
+
+# Observations preloaded before timing the reads
+HISTORY_ROWS = 1_000_000
+
+
+def run(records=2_000, history_rows=HISTORY_ROWS, seed=0):
+    rng = random.Random(seed)
+    stores = list(STORE_URLS)
+    now = time.time()
+    history = PriceHistory(os.path.join(tempfile.mkdtemp(prefix="book-comparator-history-"), "history.sqlite3"))
+
+    def observation():
+        return {'numeric_price': round(rng.uniform(10, 30), 2), 'fetched_at': now - rng.uniform(0, 180 * 86400)}
+
+    def record():
+        for _ in range(records):
+            history.record(ISBN, rng.choice(stores), observation())
+
+    best = min(timings(record, repeat=3, warmup=0))
+    results = {"history.record": throughput(records / best, "rows/s")}
+
+    # A million raw rows for other ISBNs: the reads must not depend on them
+    history._conn.executemany(
+        "INSERT INTO prices (isbn, store, price, observed_at) VALUES (?, ?, ?, ?)",
+        ((f"978{rng.randrange(10 ** 6):010d}", rng.choice(stores), 15.0, now) for _ in range(history_rows)),
+    )
+    results["history.daily"] = latency(timings(lambda: history.daily(ISBN), repeat=20))
+    results["history.stats"] = latency(timings(lambda: history.stats(ISBN, days=30), repeat=20))
+    history.close()
+    return results
+
+
+def main():
+    for name, result in run().items():
+        print(f"{name:>16}: {result['value']:>10,.1f} {result['unit']}")
+
+
+if __name__ == "__main__":
+    main()
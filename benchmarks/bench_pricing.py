@@ -0,0 +1,70 @@
+"""
+Price parsing throughput: per-string `normalize_price` against the vectorized
+`normalize_prices`, plus `format_price_difference`, in strings per second.
+
+    python -m benchmarks.bench_pricing -n 200000
+"""
+import argparse
+import random
+
+from benchmarks.common import SHORT_RUN_TIME, SHORT_RUN_TOLERANCE, best_time, throughput
+from src.pricing import format_price_difference, normalize_price, normalize_prices
+
+# Price formats seen across the stores
+PRICE_FORMATS = [
+    "{euros},{cents:02d} €",
+    "{euros},{cents:02d} €",
+    "EUR {euros},{cents:02d}",
+    "{euros}.{cents:02d}€",
+    "{thousands}.{hundreds:03d},{cents:02d} €",
+    "EUR {thousands}.{hundreds:03d},{cents:02d}",
+    "{euros},{cents:02d} EUR",
+    "No disponible",
+]
+
+
+def make_prices(n, seed=0):
+    """Generate `n` raw price strings in the formats used by the stores."""
+    rng = random.Random(seed)
+    return [
+        rng.choice(PRICE_FORMATS).format(
+            euros=rng.randint(1, 99),
+            cents=rng.randint(0, 99),
+            thousands=rng.randint(1, 9),
+            hundreds=rng.randint(0, 999),
+        )
+        for _ in range(n)
+    ]
+
+
+def run(n=100_000, repeat=3):
+    """Return the throughput of each price function, in strings/second."""
+    prices = make_prices(n)
+    numbers = [normalize_price(p) for p in prices]
+    pairs = [(18.95, p) for p in numbers]
+
+    def best(func):
+        return best_time(func, min_time=SHORT_RUN_TIME, min_repeat=repeat)
+
+    scalar = best(lambda: [normalize_price(p) for p in prices])
+    vectorized = best(lambda: normalize_prices(prices))
+    difference = best(lambda: [format_price_difference(b, c) for b, c in pairs])
+    return {
+        "pricing.normalize_price": throughput(n / scalar, "strings/s", SHORT_RUN_TOLERANCE),
+        "pricing.normalize_prices": throughput(n / vectorized, "strings/s", SHORT_RUN_TOLERANCE),
+        "pricing.format_price_difference": throughput(n / difference, "calls/s", SHORT_RUN_TOLERANCE),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-n", type=int, default=100_000, help="price strings to parse")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    for name, result in run(args.n, args.repeat).items():
+        print(f"{name:>34}: {result['value']:>12,.0f} {result['unit']}")
+
+
+if __name__ == "__main__":
+    main()
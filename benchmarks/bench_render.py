@@ -0,0 +1,49 @@
+"""
+Page render latency of `main()`: the first load of the page and a search
+whose results are already cached, run headless with Streamlit's AppTest
+against the fixture server.
+
+    python -m benchmarks.bench_render
+"""
+import os
+import time
+
+from benchmarks.common import latency, offline_environment
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "streamlit_app.py")
+
+
+def run(repeat=5):
+    offline_environment()
+    from streamlit.testing.v1 import AppTest
+
+    def first_load():
+        return AppTest.from_file(APP_PATH, default_timeout=60).run()
+
+    load_times, search_times = [], []
+    # The first search fills the cache; only the cached ones are timed
+    first_load().button[0].click().run()
+    for _ in range(repeat):
+        start = time.perf_counter()
+        app = first_load()
+        load_times.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        app.button[0].click().run()
+        search_times.append(time.perf_counter() - start)
+        if app.exception:
+            raise RuntimeError(app.exception[0].message)
+
+    return {
+        "render.first_load": latency(load_times),
+        "render.search": latency(search_times),
+    }
+
+
+def main():
+    for name, result in run().items():
+        print(f"{name:>18}: {result['value']:>10,.1f} {result['unit']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+End-to-end search latency of `cached_search_books` against the fixture
+server (cold and warm cache), and result assembly throughput over
+synthetic result sets of growing size.
+
+    python -m benchmarks.bench_search
+"""
+import random
+
+from benchmarks.common import (SHORT_RUN_TIME, SHORT_RUN_TOLERANCE, best_time, latency, offline_environment,
+                               throughput, timings)
+from src.stores import STORE_URLS
+
+# Number of ISBNs in the synthetic result sets
+RESULT_SET_SIZES = (10, 1_000, 10_000)
+
+# Cached searches per warm-search sample
+WARM_CALLS = 200
+
+def make_batch(n_isbns, seed=0):
+    """Synthetic (isbn, store_results) pairs, one result per store."""
+    rng = random.Random(seed)
+    batch = []
+    for i in range(n_isbns):
+        isbn = f"978{i:010d}"
+        store_results = []
+        for store in STORE_URLS:
+            found = rng.random() < 0.8
+            store_results.append({
+                "isbn": isbn,
+                "store": store,
+                "status": "ok" if found else "not_found",
+                "title": f"Libro {i}",
+                "price": f"{rng.randint(5, 40)},{rng.randint(0, 99):02d} €" if found else "No disponible",
+                "product_url": STORE_URLS[store].format(isbn),
+                "latency": rng.random(),
+            })
+        batch.append((isbn, store_results))
+    return batch
+
+
+def run(cold_repeat=3, warm_repeat=5):
+    offline_environment()
+    # Imported here so the UI picks up the offline environment
+    from src import ui
+    from src.batch import add_price_comparison, results_to_frame
+    from src.cache import get_result_cache
+
+    isbn = "9788478884452"
+    cache = get_result_cache()
+
+    def cold_search():
+        cache.invalidate(isbn=isbn)
+        ui.cached_search_books(isbn)
+
+    def warm_searches():
+        for _ in range(WARM_CALLS):
+            ui.cached_search_books(isbn)
+
+    # A warm search takes microseconds: time runs of them, keep the fastest
+    # run and report one search of it
+    warm = best_time(warm_searches, min_time=SHORT_RUN_TIME, min_repeat=warm_repeat) / WARM_CALLS
+    results = {
+        "search.cold": latency(timings(cold_search, cold_repeat, warmup=0)),
+        "search.warm": latency([warm], tolerance=SHORT_RUN_TOLERANCE),
+    }
+
+    for size in RESULT_SET_SIZES:
+        batch = make_batch(size)
+        best = best_time(lambda: add_price_comparison(results_to_frame(batch)), min_time=SHORT_RUN_TIME)
+        results[f"assembly.{size}"] = throughput(size * len(STORE_URLS) / best, "rows/s", SHORT_RUN_TOLERANCE)
+    return results
+
+
+def main():
+    for name, result in run().items():
+        print(f"{name:>18}: {result['value']:>12,.1f} {result['unit']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Cold start: importing the app package and drawing the first page, each in a
+fresh Python process, as a new replica would.
+
+    python -m benchmarks.bench_startup
+"""
+import json
+import os
+import subprocess
+import sys
+
+from benchmarks.common import latency, offline_environment
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(REPO_DIR, "streamlit_app.py")
+
+# Modules that must not be loaded until a search or a batch needs them
+HEAVY_MODULES = ("pandas", "pyarrow")
+
+IMPORT_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import src.ui
+elapsed = time.perf_counter() - start
+print(json.dumps({"seconds": elapsed, "loaded": [m for m in %r if m in sys.modules]}))
+""" % (HEAVY_MODULES,)
+
+FIRST_PAINT_SCRIPT = """
+import json, time
+from streamlit.testing.v1 import AppTest
+start = time.perf_counter()
+app = AppTest.from_file(%r, default_timeout=60).run()
+elapsed = time.perf_counter() - start
+print(json.dumps({"seconds": elapsed, "error": app.exception[0].message if app.exception else None}))
+""" % (APP_PATH,)
+
+
+def _run_fresh(script):
+    output = subprocess.run([sys.executable, "-c", script], cwd=REPO_DIR, env=os.environ,
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def run(repeat=5):
+    offline_environment()
+    import_times, paint_times = [], []
+    for _ in range(repeat):
+        imported = _run_fresh(IMPORT_SCRIPT)
+        if imported["loaded"]:
+            raise RuntimeError(f"Importing the app loads {', '.join(imported['loaded'])} at startup")
+        import_times.append(imported["seconds"])
+
+        painted = _run_fresh(FIRST_PAINT_SCRIPT)
+        if painted["error"]:
+            raise RuntimeError(painted["error"])
+        paint_times.append(painted["seconds"])
+
+    return {
+        "startup.import": latency(import_times),
+        "startup.first_paint": latency(paint_times),
+    }
+
+
+def main():
+    for name, result in run().items():
+        print(f"{name:>20}: {result['value']:>10,.1f} {result['unit']}")
+
+
+if __name__ == "__main__":
+    main()
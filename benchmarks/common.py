@@ -0,0 +1,81 @@
+import os
+import statistics
+import tempfile
+import time
+
+# Measurements made of short runs (microseconds to a few hundred ms) are the
+# fastest run over this many seconds, and fail only past a looser tolerance:
+# on a shared machine their speed drifts by tens of percent for seconds at a
+# time, which more samples alone don't smooth out
+SHORT_RUN_TIME = 2.0
+SHORT_RUN_TOLERANCE = 0.5
+
+
+def timings(func, repeat=5, warmup=1):
+    """Wall times in seconds of `repeat` calls to `func()`, after `warmup` calls."""
+    for _ in range(warmup):
+        func()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def best_time(func, min_time=1.0, min_repeat=5, warmup=1):
+    """
+    Fastest wall time in seconds of `func()`, called at least `min_repeat`
+    times and until `min_time` seconds have been spent.
+
+    For runs of a few milliseconds, where a handful of samples swing by tens
+    of percent with whatever else the machine is doing: the minimum over many
+    samples is what the code itself costs.
+    """
+    times = timings(func, min_repeat, warmup)
+    while sum(times) < min_time:
+        times += timings(func, min_repeat, warmup=0)
+    return min(times)
+
+
+def throughput(value, unit, tolerance=None):
+    """
+    A measurement where higher is better (items per second). `tolerance`
+    overrides the suite's regression threshold for noisier measurements.
+    """
+    result = {"value": value, "unit": unit, "higher_is_better": True}
+    if tolerance is not None:
+        result["tolerance"] = tolerance
+    return result
+
+
+def latency(times, tolerance=None):
+    """A measurement where lower is better: median of `times`, in milliseconds."""
+    result = {"value": statistics.median(times) * 1000, "unit": "ms", "higher_is_better": False}
+    if tolerance is not None:
+        result["tolerance"] = tolerance
+    return result
+
+
+_fixtures_url = None
+
+
+def offline_environment():
+    """
+    Point the app at the local fixture server and a throwaway data directory.
+
+    Must run before `src.cache` or `streamlit_app` are imported, since they
+    read these settings at import time. Returns the fixture server's URL.
+    """
+    global _fixtures_url
+    if _fixtures_url is None:
+        from src.fixture_server import start_fixture_server
+
+        _, _fixtures_url = start_fixture_server()
+        os.environ["BOOK_COMPARATOR_FIXTURES_URL"] = _fixtures_url
+        os.environ["BOOK_COMPARATOR_DATA_DIR"] = tempfile.mkdtemp(prefix="book-comparator-bench-")
+        os.environ["BOOK_COMPARATOR_METRICS_PORT"] = "0"
+        # No watchlist pre-warming running behind the measurements
+        os.environ["BOOK_COMPARATOR_WATCHLIST"] = ""
+        os.environ.pop("BOOK_COMPARATOR_DEMO", None)
+    return _fixtures_url
@@ -0,0 +1,120 @@
+"""
+Offline benchmark suite: runs every benchmark against the recorded store
+fixtures and compares the numbers with the stored baseline.
+
+    python -m benchmarks.run                  # compare with baseline.json
+    python -m benchmarks.run --save-baseline  # record a new baseline
+    python -m benchmarks.run --only pricing,parse --threshold 0.3
+
+Exits with status 1 when any measurement is worse than its baseline by more
+than the threshold (25% by default), or than its own tolerance when it has a
+looser one. Baselines are machine-specific: record
+them on the machine that runs the comparison.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+from benchmarks.common import offline_environment
+
+# Before anything imports the cache or the app
+offline_environment()
+
+from benchmarks import (bench_adapters, bench_api, bench_history, bench_pricing, bench_render,  # noqa: E402
+                        bench_search, bench_startup)
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+# Allowed slowdown relative to the baseline before a measurement fails
+REGRESSION_THRESHOLD = 0.25
+
+SUITES = {
+    "pricing": bench_pricing.run,
+    "parse": bench_adapters.run,
+    "search": bench_search.run,
+    "history": bench_history.run,
+    "render": bench_render.run,
+    "startup": bench_startup.run,
+    "api": bench_api.run,
+}
+
+
+def load_baseline(path=BASELINE_PATH):
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)["results"]
+
+
+def save_baseline(results, path=BASELINE_PATH):
+    data = {
+        "recorded_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "machine": f"{platform.system()} {platform.machine()} / Python {platform.python_version()}",
+        "results": results,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, sort_keys=True, ensure_ascii=False)
+        f.write("\n")
+
+
+def change(result, baseline):
+    """Relative change against the baseline; positive means slower/worse."""
+    if result["higher_is_better"]:
+        return baseline["value"] / result["value"] - 1
+    return result["value"] / baseline["value"] - 1
+
+
+def _number(value):
+    return f"{value:>14,.1f}" if value >= 10 else f"{value:>14.3f}"
+
+
+def compare(results, baseline, threshold=REGRESSION_THRESHOLD):
+    """Print each measurement next to its baseline and return the regressions."""
+    regressions = []
+    for name, result in results.items():
+        line = f"{name:<34} {_number(result['value'])} {result['unit']:<10}"
+        if name in baseline:
+            delta = change(result, baseline[name])
+            line += f" baseline {_number(baseline[name]['value'])} ({-delta:+.0%})"
+            if delta > max(threshold, result.get("tolerance", 0)):
+                line += "  REGRESSION"
+                regressions.append(name)
+        print(line)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the offline benchmark suite.")
+    parser.add_argument("--only", help=f"comma-separated suites to run ({', '.join(SUITES)})")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD,
+                        help="allowed slowdown before failing, as a fraction")
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the new baseline")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline file")
+    args = parser.parse_args(argv)
+
+    names = args.only.split(",") if args.only else list(SUITES)
+    results = {}
+    for name in names:
+        print(f"Running {name}...", file=sys.stderr)
+        results.update(SUITES[name]())
+
+    if args.save_baseline:
+        baseline = load_baseline(args.baseline)
+        baseline.update(results)
+        save_baseline(baseline, args.baseline)
+        compare(results, {})
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    regressions = compare(results, load_baseline(args.baseline), args.threshold)
+    if regressions:
+        print(f"{len(regressions)} regression(s) above {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1 @@
+"""Core search, scraping and pricing code for the book price comparator."""
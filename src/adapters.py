@@ -0,0 +1,300 @@
+import os
+import threading
+from urllib.parse import urljoin
+
+import requests
+from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+
+from src.offers import TOP_OFFERS, TopOffers, landed_price, parse_shipping
+from src.pricing import normalize_price
+from src.stores import STORE_URLS
+
+# (connect, read) timeouts in seconds for a single search page
+REQUEST_TIMEOUT = (3.05, 6)
+
+# Keep-alive connections kept open per store host
+POOL_SIZE = 10
+
+DEFAULT_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+    ),
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "es-ES,es;q=0.9",
+}
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """
+    Return the HTTP session shared by every adapter.
+
+    The session keeps a pool of keep-alive connections per store host, so
+    repeated lookups reuse the TCP/TLS connection instead of opening a new one.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                pool = HTTPAdapter(pool_connections=len(STORE_URLS), pool_maxsize=POOL_SIZE)
+                session.mount("https://", pool)
+                session.mount("http://", pool)
+                session.headers.update(DEFAULT_HEADERS)
+                _session = session
+    return _session
+
+
+class StoreAdapter:
+    """
+    Look up an ISBN in one store with a single GET of its search page.
+
+    Subclasses only declare the CSS selectors of the store's result markup;
+    calling the adapter with an ISBN returns a result dict (or None when the
+    store has no match), which is what the search engine expects of a scraper.
+
+    Marketplace stores list many offers for the same ISBN. Their adapters read
+    every offer on the page and return the cheapest by landed price (price
+    plus shipping), with the `top_offers` cheapest under 'offers'.
+    """
+
+    store_name = None
+    result_selector = None
+    title_selector = None
+    price_selector = None
+    image_selector = "img"
+    link_selector = "a[href]"
+    shipping_selector = None
+    condition_selector = None
+    seller_selector = None
+    marketplace = False
+    top_offers = TOP_OFFERS
+
+    def __init__(self, search_url=None, session=None, timeout=REQUEST_TIMEOUT):
+        self.search_url = search_url or STORE_URLS[self.store_name]
+        self.session = session
+        self.timeout = timeout
+
+    def __call__(self, isbn):
+        return self.parse(self.fetch(isbn), isbn)
+
+    def fetch(self, isbn):
+        """Download the store's search page for an ISBN."""
+        session = self.session or get_session()
+        response = session.get(self.search_url.format(isbn), timeout=self.timeout)
+        response.raise_for_status()
+        return response.text
+
+    def parse(self, html, isbn):
+        """Extract the first matching product (or the cheapest offer) from a search page."""
+        soup = BeautifulSoup(html, "html.parser")
+        if self.marketplace:
+            return self._parse_offers(soup, isbn)
+
+        item = soup.select_one(self.result_selector)
+        if item is None:
+            return None
+        offer = self._offer(item, self.search_url.format(isbn))
+        if offer is None:
+            return None
+        return {'isbn': isbn, 'store': self.store_name, **offer}
+
+    def iter_offers(self, soup, isbn):
+        """
+        Yield every offer on a search page that has a price, in page order.
+
+        Only the price and shipping are read here, which is all the ranking
+        needs; the rest of an offer is read once it makes the top offers.
+        """
+        for item in soup.select(self.result_selector):
+            offer = self._price(item)
+            if offer is None:
+                continue
+            amount = normalize_price(offer['price'])
+            if amount is None:
+                continue
+            offer['landed_price'] = landed_price(amount, offer.get('shipping'))
+            offer['item'] = item
+            yield offer
+
+    def _parse_offers(self, soup, isbn):
+        search_url = self.search_url.format(isbn)
+        top = TopOffers(self.top_offers).extend(self.iter_offers(soup, isbn))
+        offers = top.offers()
+        if not offers:
+            return None
+        for offer in offers:
+            offer.update(self._details(offer.pop('item'), search_url))
+
+        best = offers[0]
+        result = {'isbn': isbn, 'store': self.store_name, **best}
+        del result['landed_price']
+        if 'image_url' not in result:
+            # Any offer's cover will do: they are all the same book
+            image_urls = [offer['image_url'] for offer in offers if 'image_url' in offer]
+            if image_urls:
+                result['image_url'] = image_urls[0]
+        # Stores are compared on what the buyer pays, shipping included
+        result['numeric_price'] = best['landed_price']
+        result['offers'] = offers
+        result['offer_count'] = top.seen
+        return result
+
+    def _offer(self, item, search_url):
+        """Read one result block; None when it has no price."""
+        offer = self._price(item)
+        if offer is None:
+            return None
+        offer.update(self._details(item, search_url))
+        return offer
+
+    def _price(self, item):
+        """Price (and shipping, where the store lists it) of a result block."""
+        price = self._text(item, self.price_selector)
+        if not price:
+            return None
+        offer = {'price': price}
+        if self.shipping_selector:
+            offer['shipping'] = parse_shipping(self._text(item, self.shipping_selector))
+        return offer
+
+    def _details(self, item, search_url):
+        """Title, links, condition and seller of a result block."""
+        details = {
+            'title': self._text(item, self.title_selector) or 'No disponible',
+            'product_url': search_url,
+        }
+
+        link = item.select_one(self.link_selector)
+        if link is not None and link.get('href'):
+            details['product_url'] = urljoin(search_url, link['href'])
+
+        image = item.select_one(self.image_selector)
+        if image is not None:
+            image_url = image.get('src') or image.get('data-src')
+            if image_url:
+                details['image_url'] = urljoin(search_url, image_url)
+
+        if self.condition_selector:
+            details['condition'] = self._text(item, self.condition_selector)
+        if self.seller_selector:
+            details['seller'] = self._text(item, self.seller_selector)
+        return details
+
+    @staticmethod
+    def _text(item, selector):
+        element = item.select_one(selector)
+        if element is None:
+            return None
+        return element.get_text(" ", strip=True)
+
+
+class AmazonAdapter(StoreAdapter):
+    store_name = "Amazon"
+    result_selector = 'div[data-component-type="s-search-result"]'
+    title_selector = "h2 span"
+    price_selector = "span.a-price span.a-offscreen"
+    image_selector = "img.s-image"
+    link_selector = "h2 a[href], a.a-link-normal[href]"
+
+
+class CasaDelLibroAdapter(StoreAdapter):
+    store_name = "Casa del Libro"
+    result_selector = "div.compact-product"
+    title_selector = ".compact-product-title"
+    price_selector = ".compact-product-price"
+    image_selector = "img.compact-product-image"
+
+
+class EbayAdapter(StoreAdapter):
+    store_name = "eBay"
+    result_selector = "li.s-item"
+    title_selector = ".s-item__title"
+    price_selector = ".s-item__price"
+    image_selector = "img.s-item__image-img"
+    link_selector = "a.s-item__link[href]"
+    shipping_selector = ".s-item__shipping"
+    condition_selector = ".SECONDARY_INFO"
+    seller_selector = ".s-item__seller-info-text"
+    marketplace = True
+
+
+class ElCorteInglesAdapter(StoreAdapter):
+    store_name = "El Corte Inglés"
+    result_selector = "div.product_tile"
+    title_selector = ".product_tile-description"
+    price_selector = ".price-sale, .price"
+    image_selector = "img.js_preview_image"
+    link_selector = "a.product_tile-link[href]"
+
+
+class IberLibroAdapter(StoreAdapter):
+    store_name = "IberLibro"
+    result_selector = 'li[data-cy="listing-item"]'
+    title_selector = '[data-cy="listing-title"]'
+    price_selector = "p.item-price"
+    image_selector = "img.srp-item-image"
+    link_selector = 'a[data-cy="listing-title"][href]'
+    shipping_selector = ".item-shipping"
+    condition_selector = "p.condition"
+    seller_selector = "p.bookseller-info"
+    marketplace = True
+
+
+class LibreriaCentralAdapter(StoreAdapter):
+    store_name = "Librería Central"
+    result_selector = "div.resultado-libro"
+    title_selector = ".titulo"
+    price_selector = ".precio"
+    image_selector = "img.portada"
+
+
+# One adapter class per entry in STORE_URLS
+ADAPTERS = {
+    adapter.store_name: adapter
+    for adapter in (
+        AmazonAdapter,
+        CasaDelLibroAdapter,
+        EbayAdapter,
+        ElCorteInglesAdapter,
+        IberLibroAdapter,
+        LibreriaCentralAdapter,
+    )
+}
+
+
+def build_adapters(store_urls=None, session=None):
+    """
+    Instantiate one adapter per store.
+
+    `store_urls` overrides the search URL templates, e.g. to point every store
+    at the local fixture server instead of the live sites.
+    """
+    store_urls = store_urls or STORE_URLS
+    return {
+        store_name: ADAPTERS[store_name](search_url=store_urls[store_name], session=session)
+        for store_name in store_urls
+        if store_name in ADAPTERS
+    }
+
+
+def configured_scrapers():
+    """
+    The scrapers the app and the API search with: canned demo data when
+    BOOK_COMPARATOR_DEMO is set, adapters pointed at a local fixture server
+    (python -m src.fixture_server) when BOOK_COMPARATOR_FIXTURES_URL is, and
+    the live stores otherwise.
+    """
+    if os.environ.get("BOOK_COMPARATOR_DEMO"):
+        from src.demo import mock_scraper
+
+        return {store_name: mock_scraper(store_name) for store_name in STORE_URLS}
+    if os.environ.get("BOOK_COMPARATOR_FIXTURES_URL"):
+        from src.fixture_server import fixture_store_urls
+
+        return build_adapters(fixture_store_urls(os.environ["BOOK_COMPARATOR_FIXTURES_URL"]))
+    return build_adapters()
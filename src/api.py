@@ -0,0 +1,288 @@
+"""
+Headless JSON API over the same search engine, result cache and pricing code
+as the results page, for services that need prices without a Streamlit run.
+
+    GET  /isbn/<isbn>   every store's result for one ISBN, as JSON
+    POST /batch         ISBNs in the body (one per line, a CSV whose first
+                        column holds them, or a JSON list), answered as
+                        NDJSON: one line per ISBN, in input order, each
+                        sent as soon as it is ready
+    GET  /health
+
+    python -m src.api --port 8080
+    curl http://127.0.0.1:8080/isbn/84-7888-445-9
+    curl --data-binary @isbns.txt http://127.0.0.1:8080/batch
+"""
+import argparse
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlsplit
+
+from src.adapters import configured_scrapers
+from src.batch import BATCH_CONCURRENCY, iter_batch_results, iter_isbns
+from src.cache import get_result_cache
+from src.engine import search_isbn
+from src.history import get_price_history
+from src.isbn import InvalidISBN, canonical_isbn
+from src.metrics import API_REQUESTS, API_SECONDS, start_metrics_server
+from src.pricing import normalize_price
+from src.refresh import get_refresher, start_watchlist_prewarmer
+from src.scheduler import get_scheduler
+from src.singleflight import get_store_lookups
+from src.stores import STORE_URLS
+
+API_HOST = os.environ.get("BOOK_COMPARATOR_API_HOST", "127.0.0.1")
+API_PORT = int(os.environ.get("BOOK_COMPARATOR_API_PORT", "8080"))
+
+# Largest batch accepted in one request, in ISBNs and in body bytes
+MAX_BATCH_ISBNS = 10000
+MAX_BATCH_BYTES = 1024 * 1024
+
+
+def compare_results(isbn, store_results):
+    """
+    The JSON document for one ISBN: each store's result plus the lowest
+    price, the best store, and each store's difference to the lowest price.
+
+    Prices are the same ones the results page compares: `numeric_price`,
+    or the store's price string parsed with `normalize_price`.
+    """
+    stores = []
+    for result in store_results:
+        result = dict(result)
+        if result['status'] == 'ok' and result.get('numeric_price') is None:
+            result['numeric_price'] = normalize_price(result.get('price'))
+        stores.append(result)
+
+    priced = [r for r in stores if r['status'] == 'ok' and r.get('numeric_price') is not None]
+    lowest = min(priced, key=lambda r: r['numeric_price']) if priced else None
+    lowest_price = lowest['numeric_price'] if lowest else None
+    for result in priced:
+        diff_euros = round(result['numeric_price'] - lowest_price, 2)
+        result['is_lowest'] = result['numeric_price'] == lowest_price
+        result['diff_euros'] = diff_euros
+        result['diff_percent'] = round(diff_euros / lowest_price * 100, 2) if lowest_price > 0 else None
+
+    document = {
+        'isbn': isbn,
+        'lowest_price': lowest_price,
+        'best_store': lowest['store'] if lowest else None,
+        'stores': stores,
+    }
+    if len(priced) > 1:
+        prices = [r['numeric_price'] for r in priced]
+        document['savings_vs_avg'] = round(sum(prices) / len(prices) - lowest_price, 2)
+        document['savings_vs_max'] = round(max(prices) - lowest_price, 2)
+    return document
+
+
+def _json_line(document):
+    return json.dumps(document, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    """Route API requests to the search engine; see the module docstring."""
+
+    protocol_version = "HTTP/1.1"  # keep-alive between a client's requests
+    # Headers and body go out as separate writes; with Nagle's algorithm the
+    # body would wait for the client's delayed ACK (~40 ms) on every request
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        path = urlsplit(self.path).path
+        if path == "/health":
+            self._answer("health", self._send_json, 200, {'status': 'ok'})
+        elif path.startswith("/isbn/"):
+            self._answer("isbn", self._lookup, unquote(path[len("/isbn/"):]))
+        else:
+            self._answer("other", self._send_json, 404, {'error': "Ruta desconocida."})
+
+    def do_POST(self):
+        if urlsplit(self.path).path == "/batch":
+            self._answer("batch", self._batch)
+        else:
+            self._answer("other", self._send_json, 404, {'error': "Ruta desconocida."})
+
+    def _answer(self, endpoint, handler, *args):
+        """Run `handler(*args)`, turning unexpected errors into a 500 and timing the request."""
+        start = time.perf_counter()
+        self._code = None
+        try:
+            handler(*args)
+        except (BrokenPipeError, ConnectionResetError):
+            # The client went away mid-answer; there is no one to tell
+            self.close_connection = True
+        except Exception:
+            if self._code is None:
+                self._send_json(500, {'error': "Error interno del servidor."})
+            else:
+                # Headers are out (a streamed batch): all that is left is to hang up
+                self.close_connection = True
+        API_REQUESTS.inc(endpoint=endpoint, code=self._code)
+        API_SECONDS.observe(time.perf_counter() - start, endpoint=endpoint)
+
+    def _send_json(self, code, document):
+        body = _json_line(document)
+        self._code = code
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _lookup(self, text):
+        try:
+            isbn = canonical_isbn(text)
+        except InvalidISBN as e:
+            self._send_json(400, {'isbn': text, 'error': str(e)})
+            return
+        self._send_json(200, compare_results(isbn, self.server.search(isbn)))
+
+    def _reject(self, code, message):
+        """Answer with an error before reading the body, and close the connection it is still on."""
+        self.close_connection = True
+        self._send_json(code, {'error': message})
+
+    def _read_isbns(self):
+        """
+        The batch in the request body, as (isbns, invalid), or None after
+        answering with an error.
+        """
+        length = self.headers.get("Content-Length")
+        if length is None:
+            self._reject(411, "Falta la cabecera Content-Length.")
+            return None
+        try:
+            length = int(length)
+        except ValueError:
+            length = -1
+        if length < 0:
+            self._reject(400, "La cabecera Content-Length no es válida.")
+            return None
+        if length > MAX_BATCH_BYTES:
+            self._reject(413, f"El lote no puede ocupar más de {MAX_BATCH_BYTES} bytes.")
+            return None
+        try:
+            body = self.rfile.read(length).decode("utf-8")
+        except UnicodeDecodeError:
+            self._send_json(400, {'error': "El cuerpo debe estar codificado en UTF-8."})
+            return None
+
+        if self.headers.get("Content-Type", "").startswith("application/json"):
+            try:
+                values = json.loads(body)
+            except ValueError:
+                values = None
+            # A list of ISBNs, written as strings (or as numbers, for ISBN-13s)
+            if not isinstance(values, list) or not all(
+                isinstance(value, (str, int)) and not isinstance(value, bool) for value in values
+            ):
+                self._send_json(400, {'error': "El cuerpo debe ser una lista JSON de ISBN."})
+                return None
+            lines = [str(value) for value in values]
+        else:
+            lines = body.splitlines()
+
+        invalid = []
+        isbns = list(iter_isbns(lines, invalid))
+        if len(isbns) > MAX_BATCH_ISBNS:
+            self._send_json(413, {'error': f"El lote no puede tener más de {MAX_BATCH_ISBNS} ISBN."})
+            return None
+        return isbns, invalid
+
+    def _batch(self):
+        batch = self._read_isbns()
+        if batch is None:
+            return
+        isbns, invalid = batch
+
+        self._code = 200
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson; charset=utf-8")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        # Input that isn't an ISBN is reported first, without waiting for the lookups
+        for value in invalid:
+            try:
+                canonical_isbn(value)
+            except InvalidISBN as e:
+                self._write_chunk(_json_line({'isbn': value, 'error': str(e)}) + b"\n")
+        for isbn, store_results in self.server.search_many(isbns):
+            self._write_chunk(_json_line(compare_results(isbn, store_results)) + b"\n")
+        self._write_chunk(b"")
+
+    def _write_chunk(self, data):
+        self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class ApiServer(ThreadingHTTPServer):
+    """
+    HTTP server answering with the process-wide cache, single-flight group,
+    scheduler and price history, so API lookups and page searches in the same
+    process share them.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address, scrapers=None, store_urls=STORE_URLS, concurrency=BATCH_CONCURRENCY):
+        super().__init__(address, ApiHandler)
+        self.scrapers = scrapers if scrapers is not None else configured_scrapers()
+        self.store_urls = store_urls
+        self.concurrency = concurrency
+
+    def search(self, isbn, stale=True):
+        """
+        Every store's result for one ISBN. Unless `stale` is false, expired
+        cached results are served as they are and refreshed in the background.
+        """
+        return search_isbn(isbn, self.scrapers, store_urls=self.store_urls, cache=get_result_cache(),
+                           flights=get_store_lookups(), scheduler=get_scheduler(),
+                           history=get_price_history(), refresher=get_refresher() if stale else None)
+
+    def search_many(self, isbns):
+        """(isbn, store_results) for each ISBN in order, `concurrency` ISBNs at a time."""
+        return iter_batch_results(isbns, self.scrapers, self.store_urls, get_result_cache(), self.concurrency,
+                                  get_store_lookups(), get_scheduler(), get_price_history())
+
+
+def start_api_server(host=API_HOST, port=0, scrapers=None, concurrency=BATCH_CONCURRENCY):
+    """
+    Start the API in a background thread. Returns the server and its base
+    URL; call `server.shutdown()` when done.
+    """
+    server = ApiServer((host, port), scrapers, concurrency=concurrency)
+    thread = threading.Thread(target=server.serve_forever, name="api-server", daemon=True)
+    thread.start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="API JSON del comparador de precios de libros.")
+    parser.add_argument("--host", default=API_HOST, help="Dirección en la que escuchar")
+    parser.add_argument("--port", type=int, default=API_PORT, help="Puerto en el que escuchar")
+    parser.add_argument("--concurrency", type=int, default=BATCH_CONCURRENCY,
+                        help="ISBN de un lote consultados a la vez")
+    args = parser.parse_args(argv)
+
+    server = ApiServer((args.host, args.port), concurrency=args.concurrency)
+    start_metrics_server()
+    start_watchlist_prewarmer(lambda isbn: server.search(isbn, stale=False))
+    print(f"API escuchando en http://{args.host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
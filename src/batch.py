@@ -0,0 +1,300 @@
+"""
+Bulk ISBN comparison: run a list of ISBNs through the store lookups and
+stream one row per (ISBN, store) to CSV or Parquet.
+
+    python -m src.batch isbns.txt -o precios.csv
+    python -m src.batch isbns.csv -o precios.parquet --concurrency 8
+"""
+import argparse
+import collections
+import concurrent.futures
+import os
+import sys
+import time
+
+from src.adapters import configured_scrapers
+from src.cache import get_result_cache
+from src.engine import STORE_TIMEOUT, search_isbn
+from src.history import get_price_history
+from src.isbn import InvalidISBN, canonical_isbn
+from src.pricing import normalize_prices
+from src.scheduler import get_scheduler
+from src.singleflight import get_store_lookups
+from src.stores import STORE_URLS
+
+# ISBNs looked up at the same time (each one queries every store concurrently)
+BATCH_CONCURRENCY = 4
+
+# Batch lookups wait this long (seconds) for a store's rate limit and
+# concurrency slots, where a search from the page gives up after a few
+# seconds: a batch is after every price, not a quick answer. Their store
+# timeout and deadline grow to match.
+BATCH_ACQUIRE_TIMEOUT = 60.0
+BATCH_STORE_TIMEOUT = BATCH_ACQUIRE_TIMEOUT + STORE_TIMEOUT
+
+# Statuses of the rows where the store gave no answer, reported after a run
+FAILED_STATUSES = {"unavailable": "no disponible", "timeout": "tiempo agotado", "error": "error"}
+
+# ISBNs per chunk written to the output file
+CHUNK_SIZE = 500
+
+# Columns of the output, in order
+OUTPUT_COLUMNS = [
+    "isbn", "store", "status", "title", "price", "numeric_price", "shipping", "condition",
+    "seller", "offer_count", "product_url", "latency", "cached", "lowest_price", "best_store", "is_lowest",
+    "diff_euros", "diff_percent", "savings_vs_avg", "savings_vs_max",
+]
+
+
+def read_isbns(path, invalid=None):
+    """
+    Yield ISBNs from a text file (one per line) or a CSV whose first column
+    holds the ISBN. A header line and blank lines are skipped.
+    """
+    with open(path, encoding="utf-8") as f:
+        yield from iter_isbns(f, invalid)
+
+
+def iter_isbns(lines, invalid=None):
+    """
+    Yield the ISBNs found in an iterable of text lines, in canonical ISBN-13
+    form. Entries that aren't valid ISBNs are skipped, and appended to the
+    `invalid` list when one is given.
+    """
+    for line in lines:
+        if isinstance(line, bytes):
+            line = line.decode("utf-8")
+        value = line.split(",", 1)[0].strip().strip('"')
+        if not value or value.lower() == "isbn":
+            continue
+        try:
+            yield canonical_isbn(value)
+        except InvalidISBN:
+            if invalid is not None:
+                invalid.append(value)
+
+
+def iter_batch_results(isbns, scrapers, store_urls=None, cache=None, concurrency=BATCH_CONCURRENCY,
+                       flights=None, scheduler=None, history=None):
+    """
+    Look up every ISBN, at most `concurrency` at a time, and yield
+    (isbn, store_results) pairs in input order.
+
+    Only a bounded window of lookups is in flight, so the ISBN list is never
+    materialized and memory stays flat however long the input is. Lookups
+    wait for the `scheduler`'s slots (see BATCH_ACQUIRE_TIMEOUT) rather than
+    coming back 'unavailable' whenever the batch outpaces a store's rate limit.
+    """
+    with concurrent.futures.ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="batch") as executor:
+        window = collections.deque()
+        for isbn in isbns:
+            future = executor.submit(search_isbn, isbn, scrapers, store_urls=store_urls, cache=cache,
+                                     flights=flights, scheduler=scheduler, history=history,
+                                     acquire_timeout=BATCH_ACQUIRE_TIMEOUT, store_timeout=BATCH_STORE_TIMEOUT,
+                                     deadline=BATCH_STORE_TIMEOUT)
+            window.append((isbn, future))
+            if len(window) >= concurrency:
+                done_isbn, future = window.popleft()
+                yield done_isbn, future.result()
+        while window:
+            done_isbn, future = window.popleft()
+            yield done_isbn, future.result()
+
+
+# pandas is only imported by the frame functions below, so the JSON API can
+# use the ISBN reader and the lookup loop without loading it
+
+def results_to_frame(batch):
+    """Flatten a list of (isbn, store_results) pairs into one row per store."""
+    import pandas as pd
+
+    rows = [
+        {
+            "isbn": isbn,
+            "store": result.get("store"),
+            "status": result.get("status"),
+            "title": result.get("title"),
+            "price": result.get("price"),
+            "numeric_price": result.get("numeric_price"),
+            "shipping": result.get("shipping"),
+            "condition": result.get("condition"),
+            "seller": result.get("seller"),
+            "offer_count": result.get("offer_count"),
+            "product_url": result.get("product_url"),
+            "latency": result.get("latency"),
+            "cached": result.get("cached"),
+        }
+        for isbn, store_results in batch
+        for result in store_results
+    ]
+    df = pd.DataFrame(rows, columns=OUTPUT_COLUMNS[:13])
+    df["shipping"] = df["shipping"].astype("float64")
+    df["offer_count"] = df["offer_count"].astype("Int64")
+    return df
+
+
+def add_price_comparison(df):
+    """
+    Add lowest price, best store, differences and savings per ISBN.
+
+    Everything is computed column-wise with group transforms rather than by
+    looping over the results of each ISBN.
+    """
+    import pandas as pd
+
+    df = df.copy()
+    found = df["status"] == "ok"
+    prices = pd.to_numeric(df["numeric_price"], errors="coerce").astype("float64")
+    missing = prices.isna() & found
+    if missing.any():
+        prices[missing] = normalize_prices(df.loc[missing, "price"])
+    prices = prices.where(found)
+    df["numeric_price"] = prices
+
+    grouped = prices.groupby(df["isbn"], sort=False)
+    lowest = grouped.transform("min")
+    df["lowest_price"] = lowest
+    df["is_lowest"] = prices.notna() & (prices == lowest)
+
+    best_idx = prices.dropna().groupby(df["isbn"], sort=False).idxmin()
+    best_store = df.loc[best_idx, ["isbn", "store"]].set_index("isbn")["store"]
+    df["best_store"] = df["isbn"].map(best_store)
+
+    df["diff_euros"] = (prices - lowest).round(2)
+    df["diff_percent"] = (df["diff_euros"] / lowest.where(lowest > 0) * 100).round(2)
+    df["savings_vs_avg"] = (grouped.transform("mean") - lowest).round(2)
+    df["savings_vs_max"] = (grouped.transform("max") - lowest).round(2)
+    return df[OUTPUT_COLUMNS]
+
+
+class CsvSink:
+    """Append chunks to a CSV file, writing the header once."""
+
+    def __init__(self, path):
+        self.file = open(path, "w", encoding="utf-8", newline="")
+        self.header = True
+
+    def write(self, df):
+        df.to_csv(self.file, header=self.header, index=False)
+        self.header = False
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+class ParquetSink:
+    """Append chunks to a Parquet file as row groups."""
+
+    def __init__(self, path):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise RuntimeError("La salida Parquet necesita pyarrow (pip install pyarrow).") from e
+        self._pa = pa
+        self.schema = pa.schema([
+            ("isbn", pa.string()), ("store", pa.string()), ("status", pa.string()),
+            ("title", pa.string()), ("price", pa.string()), ("numeric_price", pa.float64()),
+            ("shipping", pa.float64()), ("condition", pa.string()), ("seller", pa.string()),
+            ("offer_count", pa.int64()), ("product_url", pa.string()), ("latency", pa.float64()), ("cached", pa.string()),
+            ("lowest_price", pa.float64()), ("best_store", pa.string()), ("is_lowest", pa.bool_()),
+            ("diff_euros", pa.float64()), ("diff_percent", pa.float64()),
+            ("savings_vs_avg", pa.float64()), ("savings_vs_max", pa.float64()),
+        ])
+        self.writer = pq.ParquetWriter(path, self.schema)
+
+    def write(self, df):
+        table = self._pa.Table.from_pandas(df, schema=self.schema, preserve_index=False)
+        self.writer.write_table(table)
+
+    def close(self):
+        self.writer.close()
+
+
+def open_sink(path, output_format=None):
+    """Open a CSV or Parquet sink, guessing the format from the extension."""
+    output_format = output_format or ("parquet" if path.endswith(".parquet") else "csv")
+    if output_format == "parquet":
+        return ParquetSink(path)
+    return CsvSink(path)
+
+
+def run_batch(isbns, output_path, scrapers=None, output_format=None, store_urls=STORE_URLS,
+              cache=None, concurrency=BATCH_CONCURRENCY, chunk_size=CHUNK_SIZE, on_progress=None, failed=None):
+    """
+    Compare prices for every ISBN and stream the rows to `output_path`.
+
+    Results are written in chunks of `chunk_size` ISBNs, so only one chunk is
+    held in memory at a time. `on_progress(done)` is called after each ISBN.
+    Without `scrapers`, the stores are queried as `configured_scrapers()`
+    says (demo data, the fixture server or the live sites). Rows where the
+    store gave no answer (FAILED_STATUSES) are appended to the `failed` list
+    as (isbn, store, status), when one is given. Returns the number of ISBNs
+    processed.
+    """
+    scrapers = scrapers or configured_scrapers()
+    cache = cache or get_result_cache()
+    sink = open_sink(output_path, output_format)
+    done = 0
+    chunk = []
+    try:
+        lookups = iter_batch_results(isbns, scrapers, store_urls, cache, concurrency,
+                                     get_store_lookups(), get_scheduler(), get_price_history())
+        for item in lookups:
+            if failed is not None:
+                isbn, store_results = item
+                failed.extend((isbn, r['store'], r['status']) for r in store_results
+                              if r['status'] in FAILED_STATUSES)
+            chunk.append(item)
+            done += 1
+            if on_progress:
+                on_progress(done)
+            if len(chunk) >= chunk_size:
+                sink.write(add_price_comparison(results_to_frame(chunk)))
+                chunk = []
+        if chunk or done == 0:
+            sink.write(add_price_comparison(results_to_frame(chunk)))
+    finally:
+        sink.close()
+    return done
+
+
+def describe_failed(failed):
+    """Summary of `run_batch`'s failed rows by store and status: "Amazon: 2 tiempo agotado, eBay: 1 error"."""
+    counts = collections.Counter((store, status) for _, store, status in failed)
+    return ", ".join(
+        f"{store}: {count} {FAILED_STATUSES[status]}" for (store, status), count in sorted(counts.items())
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compara precios de una lista de ISBN en todas las tiendas.")
+    parser.add_argument("input", help="Fichero con un ISBN por línea (o CSV con el ISBN en la primera columna); '-' para stdin")
+    parser.add_argument("-o", "--output", required=True, help="Fichero de salida (.csv o .parquet)")
+    parser.add_argument("--format", choices=["csv", "parquet"], help="Formato de salida (por defecto, según la extensión)")
+    parser.add_argument("--concurrency", type=int, default=BATCH_CONCURRENCY, help="ISBN consultados a la vez")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="ISBN por bloque escrito")
+    args = parser.parse_args(argv)
+
+    invalid = []
+    isbns = iter_isbns(sys.stdin, invalid) if args.input == "-" else read_isbns(args.input, invalid)
+    start = time.perf_counter()
+
+    def report(done):
+        if done % 100 == 0:
+            print(f"{done} ISBN procesados...", file=sys.stderr)
+
+    failed = []
+    done = run_batch(isbns, args.output, output_format=args.format, concurrency=args.concurrency,
+                     chunk_size=args.chunk_size, on_progress=report, failed=failed)
+    elapsed = time.perf_counter() - start
+    print(f"{done} ISBN en {elapsed:.1f} s -> {os.path.abspath(args.output)}", file=sys.stderr)
+    if invalid:
+        print(f"{len(invalid)} ISBN no válidos omitidos: {', '.join(invalid[:10])}", file=sys.stderr)
+    if failed:
+        print(f"{len(failed)} consultas sin respuesta de la tienda: {describe_failed(failed)}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
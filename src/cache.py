@@ -0,0 +1,231 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from src.metrics import CACHE_REQUESTS
+
+# Where the on-disk tiers (result cache, history...) are kept
+DATA_DIR = os.environ.get(
+    "BOOK_COMPARATOR_DATA_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".data"),
+)
+
+CACHE_PATH = os.path.join(DATA_DIR, "results.sqlite3")
+
+# Seconds a store result stays fresh; marketplaces change faster than shops
+DEFAULT_TTL = 900
+STORE_TTLS = {
+    "Amazon": 900,
+    "Casa del Libro": 1800,
+    "eBay": 300,
+    "El Corte Inglés": 1800,
+    "IberLibro": 600,
+    "Librería Central": 3600,
+}
+
+# Seconds past its TTL a result may still be served, while a background
+# refresh fetches a fresh one (stale-while-revalidate, see src.refresh)
+STALE_TTL = 86400
+
+# Entries kept in the in-memory tier and rows kept in the SQLite tier
+MEMORY_SIZE = 2048
+DISK_SIZE = 100_000
+
+# Only definitive answers are cached; errors and timeouts are retried
+CACHEABLE_STATUSES = ("ok", "not_found")
+
+
+class LRUCache:
+    """Thread-safe, size-bounded LRU mapping of key -> (value, expires_at)."""
+
+    def __init__(self, maxsize=MEMORY_SIZE):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, now=None):
+        now = time.time() if now is None else now
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at <= now:
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, expires_at):
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def discard(self, predicate):
+        """Remove every key for which `predicate(key)` is true."""
+        with self._lock:
+            for key in [k for k in self._data if predicate(k)]:
+                del self._data[key]
+
+    def __len__(self):
+        return len(self._data)
+
+
+class ResultCache:
+    """
+    Two-tier cache of store results keyed by (ISBN, store).
+
+    Lookups try an in-memory LRU first and fall back to a SQLite file, which
+    survives restarts and is shared by every process on the host. Each store
+    has its own TTL and both tiers are size-bounded, evicting the least
+    recently used (memory) or oldest (disk) entries. Expired entries are kept
+    for another `stale_ttl` seconds, for callers that accept a stale result.
+    """
+
+    def __init__(self, path=CACHE_PATH, memory_size=MEMORY_SIZE, disk_size=DISK_SIZE,
+                 ttls=None, default_ttl=DEFAULT_TTL, stale_ttl=STALE_TTL):
+        self.path = path
+        self.disk_size = disk_size
+        self.ttls = STORE_TTLS if ttls is None else ttls
+        self.default_ttl = default_ttl
+        self.stale_ttl = stale_ttl
+        self.memory = LRUCache(memory_size)
+        self._lock = threading.Lock()
+        self._writes = 0
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS results (
+                isbn TEXT NOT NULL,
+                store TEXT NOT NULL,
+                value TEXT NOT NULL,
+                stored_at REAL NOT NULL,
+                expires_at REAL NOT NULL,
+                PRIMARY KEY (isbn, store)
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS results_stored_at ON results (stored_at)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS results_store ON results (store)")
+
+    def ttl_for(self, store):
+        return self.ttls.get(store, self.default_ttl)
+
+    def get(self, isbn, store, record=True, allow_stale=False):
+        """
+        Return the cached result for (isbn, store), or None on a miss.
+
+        The returned dict has a 'cached' key naming the tier that answered
+        ('memory' or 'disk'). With `allow_stale`, a result past its TTL (but
+        within the stale window) is returned too, with 'stale' set to True.
+        `record=False` leaves the hit/miss counters alone, for re-checks of a
+        lookup that was already counted.
+        """
+        now = time.time()
+        key = (isbn, store)
+        entry = self.memory.get(key, now)
+        if entry is not None and (allow_stale or entry[1] > now):
+            return self._hit(entry, "memory", now, record)
+        if record:
+            CACHE_REQUESTS.inc(tier="memory", result="miss")
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM results WHERE isbn = ? AND store = ?", key
+            ).fetchone()
+        if row is None or row[1] + self.stale_ttl <= now or (row[1] <= now and not allow_stale):
+            if record:
+                CACHE_REQUESTS.inc(tier="disk", result="miss")
+            return None
+
+        entry = (json.loads(row[0]), row[1])
+        # Promote to the memory tier for the next lookup
+        self.memory.set(key, entry, row[1] + self.stale_ttl)
+        return self._hit(entry, "disk", now, record)
+
+    def _hit(self, entry, tier, now, record):
+        value, expires_at = entry
+        stale = expires_at <= now
+        if record:
+            CACHE_REQUESTS.inc(tier=tier, result="stale" if stale else "hit")
+        if stale:
+            return dict(value, cached=tier, stale=True)
+        return dict(value, cached=tier)
+
+    def set(self, isbn, store, result):
+        """Store a result in both tiers with the store's TTL."""
+        now = time.time()
+        expires_at = now + self.ttl_for(store)
+        value = {k: v for k, v in result.items() if k not in ("cached", "stale")}
+        self.memory.set((isbn, store), (value, expires_at), expires_at + self.stale_ttl)
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results (isbn, store, value, stored_at, expires_at) VALUES (?, ?, ?, ?, ?)",
+                (isbn, store, json.dumps(value), now, expires_at),
+            )
+            self._writes += 1
+            # Enforce the size bound every so often rather than on each write
+            if self._writes % 100 == 0:
+                self._evict(now)
+
+    def invalidate(self, isbn=None, store=None):
+        """
+        Drop cached results for one ISBN, one store, or one (ISBN, store) pair.
+
+        Calling it without arguments clears the whole cache.
+        """
+        def matches(key):
+            return (isbn is None or key[0] == isbn) and (store is None or key[1] == store)
+
+        self.memory.discard(matches)
+
+        clauses, params = [], []
+        if isbn is not None:
+            clauses.append("isbn = ?")
+            params.append(isbn)
+        if store is not None:
+            clauses.append("store = ?")
+            params.append(store)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            self._conn.execute(f"DELETE FROM results{where}", params)
+
+    def _evict(self, now):
+        """Drop rows past their stale window, then the oldest rows beyond the size bound."""
+        self._conn.execute("DELETE FROM results WHERE expires_at <= ?", (now - self.stale_ttl,))
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM results").fetchone()
+        if count > self.disk_size:
+            self._conn.execute(
+                "DELETE FROM results WHERE rowid IN "
+                "(SELECT rowid FROM results ORDER BY stored_at LIMIT ?)",
+                (count - self.disk_size,),
+            )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_result_cache = None
+_result_cache_lock = threading.Lock()
+
+
+def get_result_cache():
+    """Return the process-wide result cache, opening it on first use."""
+    global _result_cache
+    if _result_cache is None:
+        with _result_cache_lock:
+            if _result_cache is None:
+                _result_cache = ResultCache()
+    return _result_cache
@@ -0,0 +1,147 @@
+"""
+HTML for the results grid: every store's card, built as one string and
+drawn with a single `st.markdown` call, after the `GRID_CSS` styles.
+
+Cards are described by tuples of the fields they show (see `card_fields`),
+so the grid is memoized on them like the chart specs: reruns of the same
+search reuse the same string.
+"""
+import functools
+from html import escape
+
+from src.pricing import format_price_difference
+from src.stores import STORE_LOGOS, STORE_URLS
+
+# Different result sets whose grid HTML is kept in memory
+GRID_CACHE_SIZE = 256
+
+# Styles for the grid, sent once per search rather than with every redraw.
+# Markdown reads the string as one HTML block, so it has no blank lines.
+GRID_CSS = """<style>
+.results-grid {display: grid; grid-template-columns: repeat(2, minmax(0, 1fr)); gap: 1rem; margin-bottom: 1rem;}
+@media (max-width: 640px) {.results-grid {grid-template-columns: minmax(0, 1fr);}}
+.result-card {padding: 10px; border: 2px solid transparent; border-radius: 5px;}
+.result-card p {margin: 0 0 0.4rem 0;}
+.result-card a {text-decoration: none; color: inherit;}
+.best-price {border-color: #4CAF50; background-color: #f1f8e9;}
+.store-header {display: flex; align-items: center; margin-bottom: 10px; font-size: 1.4rem; font-weight: 600;}
+.store-logo {height: 24px; margin-right: 8px; max-width: 100px; object-fit: contain;}
+.best-price .store-logo {height: 28px;}
+.best-price .price {color: green; font-weight: bold;}
+.offer-caption {font-size: 0.85rem; opacity: 0.7;}
+.other-offers {margin: 0 0 0.6rem 0; padding-left: 1.2rem;}
+.other-offers a {text-decoration: underline;}
+.store-button {background-color: #4CAF50; color: white; border: none; padding: 5px 10px; text-align: center; border-radius: 4px; cursor: pointer; width: 100%;}
+</style>"""
+
+
+def describe_offer(offer):
+    """One line with an offer's price and shipping, condition and seller."""
+    shipping = offer.get('shipping')
+    if shipping is None:
+        parts = [offer['price']]
+    elif shipping == 0:
+        parts = [f"{offer['price']}, envío gratis"]
+    else:
+        parts = [f"{offer['price']} + {shipping:.2f}€ de envío"]
+    parts += [offer[key] for key in ('condition', 'seller') if offer.get(key)]
+    return " · ".join(parts)
+
+
+def card_fields(result, isbn):
+    """
+    What a store's card shows, as a hashable tuple:
+    (store, product_url, image_url, title, price, numeric_price, caption,
+    other_offers, offer_count), with other_offers a tuple of
+    (landed_price, product_url, description) tuples.
+    """
+    store = result.get('store', 'Tienda desconocida')
+
+    # Stores without a product link send to their search page instead
+    product_url = result.get('product_url')
+    if not product_url and store in STORE_URLS:
+        product_url = STORE_URLS[store].format(isbn)
+
+    # Marketplace offers show what the buyer pays, shipping included
+    price = result.get('price', 'No disponible')
+    caption = None
+    if result.get('offers'):
+        price = f"{result['numeric_price']:.2f}€"
+        caption = describe_offer(result)
+
+    # The next cheapest offers (at most TOP_OFFERS are kept per store)
+    other_offers = tuple(
+        (offer['landed_price'], offer.get('product_url'), describe_offer(offer))
+        for offer in result.get('offers', [])[1:]
+    )
+    return (
+        store,
+        product_url,
+        result.get('coverUrl') or result.get('image_url'),
+        result.get('title', 'No disponible'),
+        price,
+        result.get('numeric_price'),
+        caption,
+        other_offers,
+        result.get('offer_count'),
+    )
+
+
+def _link(url, content):
+    """`content` (already HTML) linked to `url` in a new tab, or as it is without a URL."""
+    if not url:
+        return content
+    return f'<a href="{escape(url)}" target="_blank">{content}</a>'
+
+
+def _card_html(card, lowest_price):
+    store, product_url, image_url, title, price, numeric_price, caption, other_offers, offer_count = card
+    is_lowest = lowest_price is not None and numeric_price == lowest_price
+
+    logo = STORE_LOGOS.get(store)
+    name = f"🏆 {escape(store)}" if is_lowest else escape(store)
+    if logo:
+        name = f'<img src="{escape(logo)}" class="store-logo" alt="{escape(store)} logo">{name}'
+    parts = [f'<div class="result-card{" best-price" if is_lowest else ""}">', f'<div class="store-header">{name}</div>']
+    if is_lowest:
+        parts.append('<p><strong>¡MEJOR PRECIO!</strong></p>')
+
+    if image_url:
+        image = f'<img src="{escape(image_url)}" width="150" alt="">'
+        parts.append(f'<p>{_link(product_url, image)}</p>')
+    parts.append(f'<p><strong>Título:</strong> {_link(product_url, escape(title))}</p>')
+    price_html = f'<span class="price">{escape(price)}</span>'
+    parts.append(f'<p><strong>Precio:</strong> {_link(product_url, price_html)}</p>')
+    if caption:
+        parts.append(f'<p class="offer-caption">{escape(caption)}</p>')
+
+    # How much more this store asks than the cheapest one
+    if not is_lowest and numeric_price is not None and lowest_price is not None:
+        diff_euros, diff_percent = format_price_difference(lowest_price, numeric_price)
+        parts.append(f'<p><strong>Diferencia:</strong> +{diff_euros} ({diff_percent} más caro)</p>')
+
+    if other_offers:
+        items = "".join(
+            f'<li>{_link(url, f"{landed:.2f}€")} · {escape(description)}</li>'
+            for landed, url, description in other_offers
+        )
+        parts.append(f'<p><strong>Otras ofertas</strong> ({offer_count} en total):</p><ul class="other-offers">{items}</ul>')
+
+    if product_url:
+        parts.append(_link(product_url, f'<button class="store-button">Ver en {escape(store)}</button>'))
+    parts.append('</div>')
+    return "".join(parts)
+
+
+@functools.lru_cache(maxsize=GRID_CACHE_SIZE)
+def results_grid_html(cards):
+    """
+    HTML of the whole results grid, two cards per row, the lowest price
+    highlighted and every other card showing its difference to it.
+
+    `cards` is a tuple of `card_fields` tuples, in the order they are laid
+    out. Memoized by that tuple.
+    """
+    prices = [card[5] for card in cards if card[5] is not None]
+    lowest_price = min(prices) if prices else None
+    return '<div class="results-grid">' + "".join(_card_html(card, lowest_price) for card in cards) + '</div>'
@@ -0,0 +1,105 @@
+"""
+Chart specs for the results page, as Vega-Lite dicts for `st.vega_lite_chart`.
+
+The browser draws them from a few hundred bytes of JSON; nothing is rendered
+into an image on the server.
+"""
+import functools
+
+# Bar colors, in store order; the store with the lowest price is drawn green
+BAR_COLORS = ['#ff9999', '#66b3ff', '#99ff99', '#ffcc99', '#c2c2f0', '#ffb3e6']
+LOWEST_PRICE_COLOR = 'green'
+
+# Different price vectors whose chart spec is kept in memory
+CHART_CACHE_SIZE = 256
+
+
+@functools.lru_cache(maxsize=CHART_CACHE_SIZE)
+def price_comparison_spec(prices):
+    """
+    Bar chart of the price at each store, with the lowest price highlighted.
+
+    `prices` is a tuple of (store, price) pairs, in the order the bars are
+    drawn. Specs are memoized by that tuple, so reruns of the same search
+    reuse the same dict; callers must not modify it.
+    """
+    lowest_price = min(price for _, price in prices)
+    values = [
+        {
+            'Tienda': store,
+            'Precio': price,
+            'Etiqueta': f'{price:.2f}€',
+            'Color': LOWEST_PRICE_COLOR if price == lowest_price else BAR_COLORS[i % len(BAR_COLORS)],
+        }
+        for i, (store, price) in enumerate(prices)
+    ]
+    x = {'field': 'Tienda', 'type': 'nominal', 'sort': None, 'axis': {'labelAngle': -45, 'title': None}}
+    y = {'field': 'Precio', 'type': 'quantitative', 'title': 'Precio (€)'}
+    return {
+        'title': 'Comparativa de precios por tienda',
+        'data': {'values': values},
+        'height': 360,
+        'layer': [
+            {
+                'mark': {'type': 'bar'},
+                'encoding': {
+                    'x': x,
+                    'y': y,
+                    'color': {'field': 'Color', 'type': 'nominal', 'scale': None, 'legend': None},
+                    'tooltip': [{'field': 'Tienda'}, {'field': 'Etiqueta', 'title': 'Precio'}],
+                },
+            },
+            {
+                'mark': {'type': 'text', 'baseline': 'bottom', 'dy': -3},
+                'encoding': {'x': x, 'y': y, 'text': {'field': 'Etiqueta'}},
+            },
+        ],
+    }
+
+
+@functools.lru_cache(maxsize=CHART_CACHE_SIZE)
+def price_history_spec(daily):
+    """
+    Line chart of each store's average price per day, over a band spanning
+    that day's lowest and highest price.
+
+    `daily` is a tuple of (day, store, min, avg, max) tuples, as aggregated by
+    the price history. Memoized like `price_comparison_spec`.
+    """
+    values = [
+        {'Día': day, 'Tienda': store, 'Mínimo': min_price, 'Media': round(avg_price, 2), 'Máximo': max_price}
+        for day, store, min_price, avg_price, max_price in daily
+    ]
+    x = {'field': 'Día', 'type': 'temporal', 'title': None}
+    color = {'field': 'Tienda', 'type': 'nominal', 'title': 'Tienda'}
+    return {
+        'title': 'Evolución del precio por tienda',
+        'data': {'values': values},
+        'height': 300,
+        'layer': [
+            {
+                'mark': {'type': 'area', 'opacity': 0.15},
+                'encoding': {
+                    'x': x,
+                    'y': {'field': 'Mínimo', 'type': 'quantitative'},
+                    'y2': {'field': 'Máximo'},
+                    'color': color,
+                },
+            },
+            {
+                'mark': {'type': 'line', 'point': True},
+                'encoding': {
+                    'x': x,
+                    'y': {'field': 'Media', 'type': 'quantitative', 'title': 'Precio (€)'},
+                    'color': color,
+                    'tooltip': [
+                        {'field': 'Día', 'type': 'temporal'},
+                        {'field': 'Tienda'},
+                        {'field': 'Mínimo'},
+                        {'field': 'Media'},
+                        {'field': 'Máximo'},
+                    ],
+                },
+            },
+        ],
+    }
@@ -0,0 +1,77 @@
+"""Canned store results for the demo mode (BOOK_COMPARATOR_DEMO)."""
+
+
+def mock_search_results(isbn):
+    """
+    Return the demo results for an ISBN, one dict per store that "has" the book.
+
+    Only used when BOOK_COMPARATOR_DEMO is set, to run the app without
+    reaching the live store websites.
+    """
+    # For demonstration, we'll return fixed data for the Harry Potter book
+    if isbn == "9788478884452":
+        results = [
+            {
+                'title': 'Harry Potter y la Piedra Filosofal',
+                'image_url': 'https://imagessl0.casadellibro.com/a/l/t7/00/9788478884452.jpg',
+                'price': '18.95€',
+                'product_url': 'https://www.casadellibro.com/libro-harry-potter-y-la-piedra-filosofal/9788478884452/599400',
+                'store': 'Casa del Libro',
+                'numeric_price': 18.95
+            },
+            {
+                'title': 'Harry Potter y la Piedra Filosofal',
+                'image_url': 'https://m.media-amazon.com/images/I/91R1AixEiLL._SY466_.jpg',
+                'price': '17.95€',
+                'product_url': 'https://www.amazon.es/Harry-Potter-Piedra-Filosofal-Rowling/dp/8478884459',
+                'store': 'Amazon',
+                'numeric_price': 17.95
+            },
+            {
+                'title': 'Harry Potter y la Piedra Filosofal',
+                'image_url': 'https://sgfm.elcorteingles.es/SGFM/dctm/MEDIA03/202204/11/00106520800776____2__600x600.jpg',
+                'price': '19.90€',
+                'product_url': 'https://www.elcorteingles.es/libros/A37733796-harry-potter-y-la-piedra-filosofal-tapa-dura/',
+                'store': 'El Corte Inglés',
+                'numeric_price': 19.90
+            },
+            {
+                'title': 'Harry Potter y la Piedra Filosofal',
+                'image_url': 'https://pictures.abebooks.com/isbn/9788478884452-es.jpg',
+                'price': '15.90€',
+                'product_url': 'https://www.iberlibro.com/products/isbn/9788478884452',
+                'store': 'IberLibro',
+                'numeric_price': 15.90
+            }
+        ]
+    else:
+        # For any other ISBN, provide sample data
+        results = [
+            {
+                'title': f'Libro con ISBN {isbn}',
+                'image_url': 'https://via.placeholder.com/150',
+                'price': '15.99€',
+                'product_url': f'https://www.casadellibro.com/?query={isbn}',
+                'store': 'Casa del Libro',
+                'numeric_price': 15.99
+            },
+            {
+                'title': f'Libro con ISBN {isbn}',
+                'image_url': 'https://via.placeholder.com/150',
+                'price': '14.95€',
+                'product_url': f'https://www.amazon.es/s?k={isbn}',
+                'store': 'Amazon',
+                'numeric_price': 14.95
+            }
+        ]
+
+    return results
+
+def mock_scraper(store_name):
+    """Build a scraper for one store that answers from the demo data."""
+    def scrape(isbn):
+        for result in mock_search_results(isbn):
+            if result['store'] == store_name:
+                return result
+        return None
+    return scrape
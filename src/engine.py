@@ -0,0 +1,263 @@
+import concurrent.futures
+import time
+
+from src.cache import CACHEABLE_STATUSES
+from src.isbn import canonical_isbn
+from src.metrics import STORE_LATENCY, STORE_LOOKUPS, STORE_REFUSALS, STORE_TIMEOUTS
+from src.scheduler import ACQUIRE_TIMEOUT, StoreUnavailable
+
+# Seconds a single store is allowed to take before it is reported as timed out
+STORE_TIMEOUT = 8.0
+
+# Seconds the whole comparison is allowed to take, whatever the per-store limits
+SEARCH_DEADLINE = 12.0
+
+
+def _default_result(isbn, store_name, store_urls, title, price):
+    """Build the placeholder result used when a store has nothing to show."""
+    result = {'isbn': isbn, 'store': store_name, 'title': title, 'price': price}
+    # Add default product URL so the user can still check the store by hand
+    if store_urls and store_name in store_urls:
+        result['product_url'] = store_urls[store_name].format(isbn)
+    return result
+
+
+def run_scraper_safely(scraper_func, isbn, store_name, store_urls=None):
+    """
+    Run a scraper function with error handling.
+
+    Always returns a result dict with a 'status' key: 'ok' when the store
+    returned a product, 'not_found' when it returned nothing, 'unavailable'
+    when the scheduler refused to call a failing or saturated store and
+    'error' when the scraper raised.
+    """
+    try:
+        result = scraper_func(isbn)
+        if result and isinstance(result, dict):
+            result = dict(result)
+            # Add store name if not already present
+            if 'store' not in result:
+                result['store'] = store_name
+
+            # Add product_url if not already present, using the base search URL
+            if 'product_url' not in result and store_urls and store_name in store_urls:
+                result['product_url'] = store_urls[store_name].format(isbn)
+
+            # Results replayed from the cache or another lookup keep their status
+            result.setdefault('status', 'ok')
+            return result
+
+        default_result = _default_result(isbn, store_name, store_urls, 'No encontrado', 'No disponible')
+        default_result['status'] = 'not_found'
+        return default_result
+    except StoreUnavailable as e:
+        default_result = _default_result(isbn, store_name, store_urls, 'No disponible', str(e))
+        default_result['status'] = 'unavailable'
+        return default_result
+    except Exception as e:
+        default_result = _default_result(isbn, store_name, store_urls, 'Error', f'Error: {str(e)}')
+        default_result['status'] = 'error'
+        return default_result
+
+
+def _timed_scrape(scraper_func, isbn, store_name, store_urls):
+    """Run a scraper and record how long it took, in seconds."""
+    start = time.perf_counter()
+    result = run_scraper_safely(scraper_func, isbn, store_name, store_urls)
+    result['latency'] = time.perf_counter() - start
+    result['fetched_at'] = time.time()
+    return result
+
+
+def _record_lookup(result):
+    """
+    Count a request sent to a store, and its latency. Lookups the scheduler
+    refused never reached the store: they are only counted as refusals.
+    """
+    if result['status'] == 'unavailable':
+        STORE_REFUSALS.inc(store=result['store'])
+        return
+    STORE_LOOKUPS.inc(store=result['store'], status=result['status'])
+    STORE_LATENCY.observe(result['latency'], store=result['store'])
+
+
+def iter_search_stores(isbn, scrapers, store_urls=None, store_timeout=STORE_TIMEOUT, deadline=SEARCH_DEADLINE,
+                       heartbeat=None):
+    """
+    Query every store concurrently and yield each result as soon as it arrives.
+
+    `scrapers` maps a store name to a callable taking the ISBN. Each store gets
+    `store_timeout` seconds and the whole search gets `deadline` seconds; stores
+    still running after their limit are yielded last with status 'timeout' and
+    are left to finish in the background without holding up the response.
+
+    Every result dict has 'status' and 'latency' (seconds) keys.
+
+    With a `heartbeat` (seconds), None is also yielded whenever that long
+    passes without a result, so a caller holding results back (e.g. to redraw
+    less often) gets a chance to flush them without waiting for the next one.
+    """
+    if not scrapers:
+        return
+
+    start = time.perf_counter()
+    overall_deadline = start + deadline
+    store_deadline = start + min(store_timeout, deadline)
+
+    executor = concurrent.futures.ThreadPoolExecutor(
+        max_workers=len(scrapers), thread_name_prefix="store-search"
+    )
+    finished = set()
+    try:
+        futures = {
+            executor.submit(_timed_scrape, scraper_func, isbn, store_name, store_urls): store_name
+            for store_name, scraper_func in scrapers.items()
+        }
+        pending = set(futures)
+        while pending:
+            remaining = min(overall_deadline, store_deadline) - time.perf_counter()
+            if remaining <= 0:
+                break
+            if heartbeat is not None:
+                remaining = min(remaining, heartbeat)
+            done, pending = concurrent.futures.wait(
+                pending, timeout=remaining, return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            if not done and heartbeat is not None:
+                yield None
+            for future in done:
+                finished.add(futures[future])
+                yield future.result()
+    finally:
+        # Don't wait for stragglers: their results are no longer wanted
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    elapsed = time.perf_counter() - start
+    for store_name in scrapers:
+        if store_name not in finished:
+            result = _default_result(isbn, store_name, store_urls, 'Tiempo agotado', 'No disponible')
+            result['status'] = 'timeout'
+            result['latency'] = elapsed
+            result['fetched_at'] = time.time()
+            STORE_TIMEOUTS.inc(store=store_name)
+            yield result
+
+
+def search_stores(isbn, scrapers, store_urls=None, **search_options):
+    """
+    Query every store concurrently and return whatever finished in time.
+
+    Same as `iter_search_stores`, but returns one result dict per store in the
+    order of `scrapers` once the search is over.
+    """
+    results = {r['store']: r for r in iter_search_stores(isbn, scrapers, store_urls, **search_options) if r}
+    return [results[store_name] for store_name in scrapers]
+
+
+def _scrape_and_cache(scraper_func, isbn, store_name, store_urls, cache, history=None):
+    """
+    Scrape one store, write a definitive answer to the cache and append the
+    price it found to the price history.
+    """
+    if cache is not None:
+        # Filled by a lookup that finished while this one was being scheduled.
+        # It answers this lookup, which the caller didn't find in the cache:
+        # drop the marker, or it would be handled as a cached result
+        result = cache.get(isbn, store_name, record=False)
+        if result is not None:
+            del result['cached']
+            return result
+
+    result = _timed_scrape(scraper_func, isbn, store_name, store_urls)
+    # Only here, in the one lookup that went out: callers that shared it
+    # through the single-flight group or found it cached sent nothing
+    _record_lookup(result)
+    if cache is not None and result['status'] in CACHEABLE_STATUSES:
+        cache.set(isbn, store_name, result)
+    if history is not None and result['status'] == 'ok':
+        history.record(isbn, store_name, result)
+    return result
+
+
+def _store_lookup(store_name, scraper_func, store_urls, cache, flights, scheduler, history=None,
+                  acquire_timeout=ACQUIRE_TIMEOUT):
+    """
+    Wrap a scraper so its answer is cached and, with a single-flight group,
+    concurrent lookups of the same (ISBN, store) share one outbound request.
+    With a scheduler, the request itself goes through the store's rate limit,
+    circuit breaker and concurrency limit, waiting up to `acquire_timeout`
+    seconds for them.
+    """
+    if scheduler is not None:
+        scraper_func = scheduler.wrap(store_name, scraper_func, acquire_timeout)
+
+    def lookup(isbn):
+        if flights is None:
+            return _scrape_and_cache(scraper_func, isbn, store_name, store_urls, cache, history)
+        return flights.do((isbn, store_name), _scrape_and_cache, scraper_func, isbn, store_name, store_urls, cache,
+                          history)
+    return lookup
+
+
+def iter_search_isbn(isbn, scrapers, store_urls=None, cache=None, flights=None, scheduler=None,
+                     history=None, refresher=None, heartbeat=None, acquire_timeout=ACQUIRE_TIMEOUT,
+                     **search_options):
+    """
+    Look an ISBN up in every store, answering from `cache` where possible, and
+    yield each store's result as soon as it is available.
+
+    Cached results come first; the stores without a fresh cached result are
+    then queried concurrently and their definitive answers are written back to
+    the cache. With a `flights` single-flight group, a lookup for an
+    (ISBN, store) already in flight (e.g. from another session) waits for that
+    one instead of sending its own request, and with a `scheduler` each request
+    respects its store's limits, waiting up to `acquire_timeout` seconds for
+    them before the store is reported 'unavailable'. Cached results carry a
+    'cached' key naming the tier that answered. Prices fetched from a store
+    (not from the cache) are appended to `history`, when given.
+
+    With a `refresher` (src.refresh), expired cached results are still used:
+    they are yielded at once with 'stale' set, and refreshed in the background
+    for the next search (stale-while-revalidate).
+
+    With a `heartbeat` (see `iter_search_stores`), None is also yielded once
+    the cached results are out and stores remain to be queried.
+
+    `isbn` may be an ISBN-10 or ISBN-13, with or without separators; it is
+    looked up, cached and recorded in its canonical ISBN-13 form. Raises
+    InvalidISBN, before any store is queried, when it isn't a valid ISBN.
+    """
+    isbn = canonical_isbn(isbn)
+    missing = dict(scrapers)
+    if cache is not None:
+        for store_name, scraper_func in scrapers.items():
+            result = cache.get(isbn, store_name, allow_stale=refresher is not None)
+            if result is None:
+                continue
+            del missing[store_name]
+            if result.get('stale'):
+                lookup = _store_lookup(store_name, scraper_func, store_urls, cache, flights, scheduler, history)
+                refresher.submit((isbn, store_name), lookup, isbn)
+            yield result
+        if heartbeat is not None and missing and len(missing) < len(scrapers):
+            yield None
+
+    lookups = {
+        store_name: _store_lookup(store_name, scraper_func, store_urls, cache, flights, scheduler, history,
+                                  acquire_timeout)
+        for store_name, scraper_func in missing.items()
+    }
+    yield from iter_search_stores(isbn, lookups, store_urls=store_urls, heartbeat=heartbeat, **search_options)
+
+
+def search_isbn(isbn, scrapers, store_urls=None, cache=None, flights=None, scheduler=None, history=None,
+                refresher=None, **search_options):
+    """
+    Look an ISBN up in every store, answering from `cache` where possible.
+
+    Same as `iter_search_isbn`, but returns one result dict per store in the
+    order of `scrapers` once every store has answered or timed out.
+    """
+    results = {r['store']: r for r in iter_search_isbn(isbn, scrapers, store_urls, cache, flights, scheduler,
+                                                       history, refresher, **search_options) if r}
+    return [results[store_name] for store_name in scrapers]
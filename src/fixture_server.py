@@ -0,0 +1,104 @@
+"""
+Local stand-in for the store websites, serving the saved HTML fixtures.
+
+Point the adapters at it with `build_adapters(fixture_store_urls(base_url))`
+to exercise the whole HTTP path offline:
+
+    python -m src.fixture_server --port 8765
+"""
+import argparse
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fixtures", "stores")
+
+# Fixture file (without extension) served for each store
+FIXTURE_FILES = {
+    "Amazon": "amazon",
+    "Casa del Libro": "casadellibro",
+    "eBay": "ebay",
+    "El Corte Inglés": "elcorteingles",
+    "IberLibro": "iberlibro",
+    "Librería Central": "libreriacentral",
+}
+
+# Page served for any path that doesn't match a store, i.e. "no results"
+EMPTY_FIXTURE = "empty"
+
+
+def load_fixture(name):
+    """Read a saved store page from the fixtures directory."""
+    with open(os.path.join(FIXTURES_DIR, f"{name}.html"), "rb") as f:
+        return f.read()
+
+
+def fixture_store_urls(base_url):
+    """Search URL templates that send every store to the fixture server."""
+    return {store: f"{base_url}/{slug}?q={{}}" for store, slug in FIXTURE_FILES.items()}
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """Serve `/<fixture>?q=<isbn>` from the fixtures directory."""
+
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real stores
+
+    def do_GET(self):
+        name = urlsplit(self.path).path.strip("/")
+        if name not in self.server.pages:
+            name = EMPTY_FIXTURE
+
+        delay = self.server.delays.get(name, 0)
+        if delay:
+            time.sleep(delay)
+
+        body = self.server.pages[name]
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_fixture_server(host="127.0.0.1", port=0, delays=None):
+    """
+    Start the fixture server in a background thread.
+
+    `delays` maps a fixture name to seconds to wait before answering, to
+    simulate a slow store. Returns the server and its base URL; call
+    `server.shutdown()` when done.
+    """
+    server = ThreadingHTTPServer((host, port), FixtureHandler)
+    server.daemon_threads = True
+    server.pages = {name: load_fixture(name) for name in list(FIXTURE_FILES.values()) + [EMPTY_FIXTURE]}
+    server.delays = delays or {}
+    thread = threading.Thread(target=server.serve_forever, name="fixture-server", daemon=True)
+    thread.start()
+    base_url = f"http://{server.server_address[0]}:{server.server_address[1]}"
+    return server, base_url
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the saved store pages locally.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    server, base_url = start_fixture_server(args.host, args.port)
+    print(f"Serving store fixtures on {base_url}")
+    for store, url in fixture_store_urls(base_url).items():
+        print(f"  {store}: {url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+"""
+Append-only price history: every price a store returns is kept, so the app
+can tell whether today's price is a good one and how each store moves.
+
+Aggregates are maintained on insert rather than computed by scanning the
+history: `price_stats` keeps count/sum/min/max per (ISBN, store) and
+`price_daily` the same per day, so the trend view and rolling windows read a
+handful of rows whatever the size of the history.
+"""
+import os
+import sqlite3
+import threading
+import time
+
+from src.cache import DATA_DIR
+from src.pricing import normalize_price
+
+HISTORY_PATH = os.path.join(DATA_DIR, "history.sqlite3")
+
+# Days shown by default in the trend view
+HISTORY_DAYS = 90
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS prices (
+        isbn TEXT NOT NULL,
+        store TEXT NOT NULL,
+        price REAL NOT NULL,
+        observed_at REAL NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS prices_isbn_store ON prices (isbn, store, observed_at)",
+    """
+    CREATE TABLE IF NOT EXISTS price_stats (
+        isbn TEXT NOT NULL,
+        store TEXT NOT NULL,
+        count INTEGER NOT NULL,
+        total REAL NOT NULL,
+        min_price REAL NOT NULL,
+        max_price REAL NOT NULL,
+        last_price REAL NOT NULL,
+        first_seen REAL NOT NULL,
+        last_seen REAL NOT NULL,
+        PRIMARY KEY (isbn, store)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS price_daily (
+        isbn TEXT NOT NULL,
+        store TEXT NOT NULL,
+        day TEXT NOT NULL,
+        count INTEGER NOT NULL,
+        total REAL NOT NULL,
+        min_price REAL NOT NULL,
+        max_price REAL NOT NULL,
+        PRIMARY KEY (isbn, store, day)
+    )
+    """,
+)
+
+
+def _day(timestamp):
+    """UTC day of a timestamp, as YYYY-MM-DD."""
+    return time.strftime("%Y-%m-%d", time.gmtime(timestamp))
+
+
+class PriceHistory:
+    """
+    SQLite price history of (ISBN, store) observations.
+
+    `record` appends one row to `prices` and folds it into the all-time and
+    daily aggregates in the same transaction; rows are never updated or
+    deleted.
+    """
+
+    def __init__(self, path=HISTORY_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        for statement in _SCHEMA:
+            self._conn.execute(statement)
+
+    def record(self, isbn, store, result):
+        """
+        Append the price of a store result. Returns False, recording nothing,
+        when the result has no readable price.
+        """
+        price = result.get('numeric_price')
+        if price is None:
+            price = normalize_price(result.get('price'))
+        if price is None:
+            return False
+        observed_at = result.get('fetched_at') or time.time()
+
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.execute(
+                    "INSERT INTO prices (isbn, store, price, observed_at) VALUES (?, ?, ?, ?)",
+                    (isbn, store, price, observed_at),
+                )
+                self._conn.execute(
+                    """
+                    INSERT INTO price_stats VALUES (?, ?, 1, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (isbn, store) DO UPDATE SET
+                        count = count + 1,
+                        total = total + excluded.total,
+                        min_price = min(min_price, excluded.min_price),
+                        max_price = max(max_price, excluded.max_price),
+                        last_price = CASE WHEN excluded.last_seen >= last_seen
+                                          THEN excluded.last_price ELSE last_price END,
+                        first_seen = min(first_seen, excluded.first_seen),
+                        last_seen = max(last_seen, excluded.last_seen)
+                    """,
+                    (isbn, store, price, price, price, price, observed_at, observed_at),
+                )
+                self._conn.execute(
+                    """
+                    INSERT INTO price_daily VALUES (?, ?, ?, 1, ?, ?, ?)
+                    ON CONFLICT (isbn, store, day) DO UPDATE SET
+                        count = count + 1,
+                        total = total + excluded.total,
+                        min_price = min(min_price, excluded.min_price),
+                        max_price = max(max_price, excluded.max_price)
+                    """,
+                    (isbn, store, _day(observed_at), price, price, price),
+                )
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+        return True
+
+    def stats(self, isbn, days=None):
+        """
+        Price summary per store for an ISBN: {store: {count, min, avg, max}}.
+
+        Covers the whole history, or only the last `days` days (a rolling
+        window over the daily aggregates). The all-time summary also has the
+        last price seen and when.
+        """
+        with self._lock:
+            if days is None:
+                rows = self._conn.execute(
+                    "SELECT store, count, total, min_price, max_price, last_price, last_seen "
+                    "FROM price_stats WHERE isbn = ?",
+                    (isbn,),
+                ).fetchall()
+            else:
+                rows = self._conn.execute(
+                    "SELECT store, sum(count), sum(total), min(min_price), max(max_price) "
+                    "FROM price_daily WHERE isbn = ? AND day > ? GROUP BY store",
+                    (isbn, _day(time.time() - days * 86400)),
+                ).fetchall()
+
+        stats = {}
+        for store, count, total, min_price, max_price, *last in rows:
+            stats[store] = {'count': count, 'min': min_price, 'avg': total / count, 'max': max_price}
+            if last:
+                stats[store]['last'], stats[store]['last_seen'] = last
+        return stats
+
+    def daily(self, isbn, days=HISTORY_DAYS):
+        """
+        Daily min/avg/max per store for an ISBN over the last `days` days,
+        as a list of dicts ordered by day.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT day, store, count, total, min_price, max_price FROM price_daily "
+                "WHERE isbn = ? AND day > ? ORDER BY day, store",
+                (isbn, _day(time.time() - days * 86400)),
+            ).fetchall()
+        return [
+            {'day': day, 'store': store, 'count': count, 'min': min_price, 'avg': total / count, 'max': max_price}
+            for day, store, count, total, min_price, max_price in rows
+        ]
+
+    def prices(self, isbn, store=None, since=None):
+        """Raw observations for an ISBN, oldest first, as (store, price, observed_at) tuples."""
+        clauses, params = ["isbn = ?"], [isbn]
+        if store is not None:
+            clauses.append("store = ?")
+            params.append(store)
+        if since is not None:
+            clauses.append("observed_at >= ?")
+            params.append(since)
+        with self._lock:
+            return self._conn.execute(
+                f"SELECT store, price, observed_at FROM prices WHERE {' AND '.join(clauses)} ORDER BY observed_at",
+                params,
+            ).fetchall()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_price_history = None
+_price_history_lock = threading.Lock()
+
+
+def get_price_history():
+    """Return the process-wide price history, opening it on first use."""
+    global _price_history
+    if _price_history is None:
+        with _price_history_lock:
+            if _price_history is None:
+                _price_history = PriceHistory()
+    return _price_history
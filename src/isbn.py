@@ -0,0 +1,89 @@
+"""
+ISBN canonicalization. Every ISBN is looked up, cached and recorded as its
+ISBN-13 without separators, so a book searched as "0-8044-2957-X",
+080442957X or 9780804429573 shares one cache, single-flight and history
+entry, and input with a wrong check digit never reaches the stores.
+"""
+import functools
+import re
+
+# Characters people put inside ISBNs that are not part of it
+_SEPARATORS_RE = re.compile(r'[\s\-\u2010-\u2015]')
+
+_ISBN10_RE = re.compile(r'[0-9]{9}[0-9X]')
+_ISBN13_RE = re.compile(r'97[89][0-9]{10}')
+
+# Different inputs whose canonical form is kept in memory
+CANONICAL_CACHE_SIZE = 4096
+
+
+class InvalidISBN(ValueError):
+    """Raised for input that is not a valid ISBN-10 or ISBN-13."""
+
+
+def clean_isbn(text):
+    """Strip spaces and hyphens and upper-case the X check digit: "0-8044-2957-x" -> "080442957X"."""
+    return _SEPARATORS_RE.sub('', str(text)).upper()
+
+
+def isbn10_check_digit(first9):
+    """Check digit ('0'-'9' or 'X') for the first nine digits of an ISBN-10."""
+    total = sum((10 - i) * int(digit) for i, digit in enumerate(first9))
+    check = (11 - total % 11) % 11
+    return 'X' if check == 10 else str(check)
+
+
+def isbn13_check_digit(first12):
+    """Check digit for the first twelve digits of an ISBN-13."""
+    total = sum(int(digit) * (3 if i % 2 else 1) for i, digit in enumerate(first12))
+    return str((10 - total % 10) % 10)
+
+
+def is_valid_isbn10(isbn):
+    return bool(_ISBN10_RE.fullmatch(isbn)) and isbn10_check_digit(isbn[:9]) == isbn[9]
+
+
+def is_valid_isbn13(isbn):
+    return bool(_ISBN13_RE.fullmatch(isbn)) and isbn13_check_digit(isbn[:12]) == isbn[12]
+
+
+def isbn10_to_isbn13(isbn10):
+    """ISBN-13 of a (clean, valid) ISBN-10: the 978 prefix and a new check digit."""
+    first12 = '978' + isbn10[:9]
+    return first12 + isbn13_check_digit(first12)
+
+
+def isbn13_to_isbn10(isbn13):
+    """ISBN-10 of a (clean, valid) ISBN-13, or None for 979 ISBNs, which have none."""
+    if not isbn13.startswith('978'):
+        return None
+    first9 = isbn13[3:12]
+    return first9 + isbn10_check_digit(first9)
+
+
+@functools.lru_cache(maxsize=CANONICAL_CACHE_SIZE)
+def canonical_isbn(text):
+    """
+    Return the canonical form of an ISBN: its ISBN-13, without separators.
+
+    Accepts ISBN-10 (with an X check digit) and ISBN-13, with or without
+    hyphens and spaces. Raises InvalidISBN when the input has the wrong
+    length or characters, or a check digit that doesn't match.
+
+    Memoized by input, since every search of a popular book canonicalizes
+    the same string again; invalid input is not cached and raises each time.
+    """
+    isbn = clean_isbn(text)
+    if len(isbn) == 10:
+        if not _ISBN10_RE.fullmatch(isbn):
+            raise InvalidISBN("Un ISBN-10 tiene 9 dígitos más un dígito de control (0-9 o X).")
+        if not is_valid_isbn10(isbn):
+            raise InvalidISBN("El dígito de control del ISBN-10 no es correcto.")
+        return isbn10_to_isbn13(isbn)
+    if len(isbn) == 13:
+        if not _ISBN13_RE.fullmatch(isbn):
+            raise InvalidISBN("Un ISBN-13 tiene 13 dígitos y empieza por 978 o 979.")
+        if not is_valid_isbn13(isbn):
+            raise InvalidISBN("El dígito de control del ISBN-13 no es correcto.")
+        return isbn
+    raise InvalidISBN("Un ISBN tiene 10 o 13 caracteres, sin contar guiones ni espacios.")
@@ -0,0 +1,227 @@
+"""
+In-process performance metrics, exported in Prometheus text format.
+
+The counters and histograms below are updated by the cache, the search
+engine, the results page and the JSON API. `start_metrics_server()` serves
+them on http://127.0.0.1:9464/metrics (BOOK_COMPARATOR_METRICS_PORT, 0 to disable).
+"""
+import bisect
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+METRICS_HOST = os.environ.get("BOOK_COMPARATOR_METRICS_HOST", "127.0.0.1")
+METRICS_PORT = int(os.environ.get("BOOK_COMPARATOR_METRICS_PORT", "9464"))
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_labels(labelnames, labelvalues, extra=()):
+    pairs = list(zip(labelnames, labelvalues)) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in pairs)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+
+class Metric:
+    """Base class: a named family of values keyed by label values."""
+
+    type = None
+
+    def __init__(self, name, documentation, labelnames=(), registry=None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+        (registry if registry is not None else REGISTRY).register(self)
+
+    def _key(self, labels):
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self):
+        """Return a snapshot of label values -> value."""
+        with self._lock:
+            return dict(self._values)
+
+    def expose(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+        for key, value in sorted(self.samples().items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {value}")
+        return lines
+
+
+class Counter(Metric):
+    """Monotonically increasing count."""
+
+    type = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+
+class Histogram(Metric):
+    """Distribution of observed values in cumulative buckets."""
+
+    type = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS, registry=None):
+        self.buckets = tuple(buckets)
+        super().__init__(name, documentation, labelnames, registry)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            counts, total = self._values.get(key, ([0] * (len(self.buckets) + 1), 0.0))
+            counts[bisect.bisect_left(self.buckets, value)] += 1
+            self._values[key] = (counts, total + value)
+
+    def samples(self):
+        with self._lock:
+            return {key: (list(counts), total) for key, (counts, total) in self._values.items()}
+
+    def count(self, **labels):
+        counts, _ = self.samples().get(self._key(labels), ([0], 0.0))
+        return sum(counts)
+
+    def mean(self, **labels):
+        counts, total = self.samples().get(self._key(labels), ([0], 0.0))
+        n = sum(counts)
+        return total / n if n else None
+
+    def quantile(self, q, **labels):
+        """Estimate the `q` quantile by interpolating within its bucket."""
+        counts, _ = self.samples().get(self._key(labels), ([0], 0.0))
+        n = sum(counts)
+        if not n:
+            return None
+        rank = q * n
+        seen = 0
+        for i, count in enumerate(counts):
+            if seen + count >= rank and count:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else self.buckets[-1]
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+        return self.buckets[-1]
+
+    def expose(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for key, (counts, total) in sorted(self.samples().items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, [('le', le)])} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {total}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class Registry:
+    """The set of metrics exported together."""
+
+    def __init__(self):
+        self._metrics = []
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            self._metrics.append(metric)
+
+    def expose(self):
+        """Render every metric in the Prometheus text exposition format."""
+        with self._lock:
+            metrics = list(self._metrics)
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.expose())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+CACHE_REQUESTS = Counter(
+    "book_cache_requests_total", "Result cache lookups by tier and outcome (hit, stale or miss).", ["tier", "result"]
+)
+STORE_LOOKUPS = Counter(
+    "book_store_lookups_total", "Requests sent to a store, by store and result status.", ["store", "status"]
+)
+STORE_LATENCY = Histogram(
+    "book_store_lookup_seconds", "Latency of the requests sent to a store.", ["store"]
+)
+STORE_REFUSALS = Counter(
+    "book_store_refusals_total", "Lookups the scheduler refused to send to a failing or saturated store.",
+    ["store"]
+)
+STORE_TIMEOUTS = Counter(
+    "book_store_timeouts_total", "Searches that stopped waiting for a store's answer.", ["store"]
+)
+LOOKUPS_COALESCED = Counter(
+    "book_lookups_coalesced_total", "Lookups that joined an identical one already in flight."
+)
+BACKGROUND_REFRESHES = Counter(
+    "book_background_refreshes_total", "Stale cache entries served right away and refreshed in the background."
+)
+RENDER_SECONDS = Histogram(
+    "book_results_render_seconds", "Time to draw the results grid and chart for a search."
+)
+STARTUP_SECONDS = Histogram(
+    "book_startup_seconds", "Time from importing the app to the end of its first page run, once per process."
+)
+API_REQUESTS = Counter(
+    "book_api_requests_total", "Requests to the JSON API by endpoint and HTTP status.", ["endpoint", "code"]
+)
+API_SECONDS = Histogram(
+    "book_api_request_seconds", "Time to answer a JSON API request, until the last byte is sent.", ["endpoint"]
+)
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?", 1)[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        body = REGISTRY.expose().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+_server = None
+_server_started = False
+_server_lock = threading.Lock()
+
+
+def start_metrics_server(host=METRICS_HOST, port=METRICS_PORT):
+    """
+    Serve /metrics from a background thread, once per process.
+
+    Returns the server, or None when disabled (port 0) or when the port is
+    already taken, e.g. by another replica on the same host.
+    """
+    global _server, _server_started
+    with _server_lock:
+        if port and not _server_started:
+            _server_started = True
+            try:
+                _server = ThreadingHTTPServer((host, port), MetricsHandler)
+            except OSError:
+                return None
+            _server.daemon_threads = True
+            threading.Thread(target=_server.serve_forever, name="metrics-server", daemon=True).start()
+    return _server
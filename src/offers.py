@@ -0,0 +1,73 @@
+"""
+Offers from marketplace stores (eBay, IberLibro), where one ISBN is sold by
+many sellers at different prices, conditions and shipping costs.
+
+Adapters stream every offer on the page through a `TopOffers` aggregator,
+which only keeps the `k` cheapest by landed price (price plus shipping) in a
+bounded heap, so a listing with hundreds of offers costs the same memory
+and rendering as one with five.
+"""
+import heapq
+import itertools
+import re
+
+from src.pricing import normalize_price
+
+# Offers kept (and shown) per store
+TOP_OFFERS = 5
+
+_FREE_SHIPPING_RE = re.compile(r'gratis|gratuito|free', re.IGNORECASE)
+
+
+def parse_shipping(text):
+    """
+    Shipping cost in a store's shipping label: "+3,99 EUR de envío" -> 3.99,
+    "Envío gratis" -> 0.0. None when there is no label or no amount in it.
+    """
+    if not text:
+        return None
+    if _FREE_SHIPPING_RE.search(text):
+        return 0.0
+    return normalize_price(text)
+
+
+def landed_price(price, shipping):
+    """What the buyer pays: price plus shipping, unknown shipping counting as free."""
+    return round(price + (shipping or 0.0), 2)
+
+
+class TopOffers:
+    """
+    The `k` cheapest offers seen so far, by landed price.
+
+    Offers are dicts with a 'landed_price' key. A max-heap of size `k` holds
+    the current top offers: each new offer is compared with the most
+    expensive of them and either replaces it or is dropped, in O(log k).
+    """
+
+    def __init__(self, k=TOP_OFFERS):
+        self.k = k
+        self.seen = 0
+        self._heap = []
+        # Ties keep the order the store listed them in
+        self._order = itertools.count()
+
+    def add(self, offer):
+        self.seen += 1
+        entry = (-offer['landed_price'], -next(self._order), offer)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        elif entry > self._heap[0]:
+            heapq.heapreplace(self._heap, entry)
+
+    def extend(self, offers):
+        for offer in offers:
+            self.add(offer)
+        return self
+
+    def offers(self):
+        """The kept offers, cheapest first."""
+        return [offer for _, _, offer in sorted(self._heap, reverse=True)]
+
+    def __len__(self):
+        return len(self._heap)
@@ -0,0 +1,133 @@
+import re
+
+# No-break spaces used as thousands separators; spelled out because RE2
+# (used by pyarrow) doesn't include them in \s
+_NBSP = '\u00a0\u202f'
+
+# First number in a price string, keeping its thousands/decimal separators:
+# "1.234,56 €" -> "1.234,56", "EUR 15,90" -> "15,90", "$1,250.00" -> "1,250.00"
+NUMBER_PATTERN = r'(?P<number>\d{1,3}(?:[.,\s' + _NBSP + r']\d{3})+(?:[.,]\d+)?|\d+(?:[.,]\d+)?)'
+
+# Split a number into integer part and decimals. Only a last separator followed
+# by one or two digits is a decimal separator; any other is a thousands one.
+SPLIT_PATTERN = r'^(?P<integer>.*?)(?:[.,](?P<decimals>\d{1,2}))?$'
+
+SEPARATORS_PATTERN = r'[.,\s' + _NBSP + r']'
+
+# Currency markers found in store prices, mapped to their ISO code
+CURRENCY_PATTERN = r'(?P<currency>€|EUR|US\$|USD|\$|£|GBP)'
+CURRENCY_CODES = {
+    '€': 'EUR', 'EUR': 'EUR',
+    'US$': 'USD', 'USD': 'USD', '$': 'USD',
+    '£': 'GBP', 'GBP': 'GBP',
+}
+
+_NUMBER_RE = re.compile(NUMBER_PATTERN)
+_SPLIT_RE = re.compile(SPLIT_PATTERN)
+_SEPARATORS_RE = re.compile(SEPARATORS_PATTERN)
+_CURRENCY_RE = re.compile(CURRENCY_PATTERN)
+
+
+def normalize_price(price_str):
+    """Normalize price strings to float values."""
+    if not price_str or price_str == 'Not Found':
+        return None
+
+    # Extract the first number, then work out which separator is the decimal one
+    match = _NUMBER_RE.search(price_str)
+    if match:
+        integer, decimals = _SPLIT_RE.match(match.group(1)).groups()
+        return float(f"{_SEPARATORS_RE.sub('', integer)}.{decimals or '0'}")
+
+    return None
+
+
+def detect_currency(price_str):
+    """Return the ISO code of the currency in a price string, or None."""
+    if not price_str:
+        return None
+    match = _CURRENCY_RE.search(price_str)
+    return CURRENCY_CODES[match.group(1)] if match else None
+
+
+# pandas and pyarrow are only imported by the column functions below, so
+# importing this module for the scalar helpers stays cheap
+
+def _arrow_compute():
+    """Return pyarrow.compute, or None when pyarrow isn't installed."""
+    try:
+        import pyarrow.compute as pc
+    except ImportError:
+        return None
+    return pc
+
+
+def _to_arrow(text):
+    import pyarrow as pa
+    try:
+        return pa.array(text, type=pa.string(), from_pandas=True)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # Non-string values mixed in: convert them one by one
+        return pa.array(text.astype("string"), type=pa.string(), from_pandas=True)
+
+
+def normalize_prices(prices):
+    """
+    Vectorized `normalize_price` for a whole Series/array of raw price strings.
+
+    Runs the regular expressions over the whole column at once with pyarrow's
+    compute kernels (falling back to pandas' `str` methods without pyarrow).
+    Returns a float64 Series, NaN where no price could be read, keeping the
+    index of `prices` when it is a Series.
+    """
+    import pandas as pd
+
+    text = pd.Series(prices, copy=False)
+    pc = _arrow_compute()
+    if pc is None:
+        text = text.astype("string")
+        numbers = text.str.extract(NUMBER_PATTERN, expand=False)
+        parts = numbers.str.extract(SPLIT_PATTERN)
+        amounts = parts["integer"].str.replace(SEPARATORS_PATTERN, '', regex=True) + '.' + parts["decimals"].fillna('0')
+        return pd.to_numeric(amounts, errors='coerce').astype('float64')
+
+    import pyarrow as pa
+    numbers = pc.struct_field(pc.extract_regex(_to_arrow(text), NUMBER_PATTERN), [0])
+    parts = pc.extract_regex(numbers, SPLIT_PATTERN)
+    integer = pc.replace_substring_regex(pc.struct_field(parts, [0]), SEPARATORS_PATTERN, '')
+    decimals = pc.struct_field(parts, [1])
+    decimals = pc.if_else(pc.equal(decimals, ''), '0', decimals)
+    amounts = pc.cast(pc.binary_join_element_wise(integer, decimals, '.'), pa.float64())
+    return pd.Series(amounts.to_numpy(zero_copy_only=False), index=text.index, dtype='float64')
+
+
+def parse_prices(prices):
+    """
+    Parse a Series/array of raw price strings into amount and currency columns.
+
+    Returns a DataFrame with a float64 'amount' column and a 'currency' column
+    holding ISO codes (missing where the string has no currency marker).
+    """
+    import pandas as pd
+
+    text = pd.Series(prices, copy=False)
+    pc = _arrow_compute()
+    if pc is None:
+        markers = text.astype("string").str.extract(CURRENCY_PATTERN, expand=False)
+    else:
+        markers = pc.struct_field(pc.extract_regex(_to_arrow(text), CURRENCY_PATTERN), [0])
+        markers = pd.Series(markers.to_numpy(zero_copy_only=False), index=text.index)
+    currency = markers.map(CURRENCY_CODES, na_action='ignore')
+    return pd.DataFrame({'amount': normalize_prices(text), 'currency': currency}, index=text.index)
+
+
+def format_price_difference(base_price, compare_price):
+    """Format price difference in euros and percentage."""
+    if base_price is None or compare_price is None:
+        return "N/A", "N/A"
+
+    diff_euros = compare_price - base_price
+    if base_price > 0:  # Avoid division by zero
+        diff_percent = (diff_euros / base_price) * 100
+        return f"{diff_euros:.2f} €", f"{diff_percent:.2f}%"
+    return f"{diff_euros:.2f} €", "N/A"
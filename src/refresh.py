@@ -0,0 +1,184 @@
+"""
+Background cache refreshing, so users almost never wait for a cold lookup:
+
+- stale-while-revalidate: a search that finds an expired result shows it
+  right away and refreshes it in the background (see `iter_search_isbn`'s
+  `refresher` argument);
+- a watchlist of hot ISBNs is looked up on a schedule, a few at a time, so
+  their results are fresh before anyone asks for them.
+
+    python -m src.refresh                      # keep the default watchlist warm
+    python -m src.refresh 9788478884452 9788498387087 --interval 60
+"""
+import argparse
+import concurrent.futures
+import os
+import sys
+import threading
+
+from src.adapters import configured_scrapers
+from src.cache import get_result_cache
+from src.engine import search_isbn
+from src.history import get_price_history
+from src.metrics import BACKGROUND_REFRESHES
+from src.scheduler import get_scheduler
+from src.singleflight import get_store_lookups
+from src.stores import STORE_URLS
+
+# Stale results refreshed at the same time
+REFRESH_CONCURRENCY = 4
+
+# Hot ISBNs kept warm, as a comma-separated list
+WATCHLIST = [
+    isbn.strip()
+    for isbn in os.environ.get("BOOK_COMPARATOR_WATCHLIST", "9788478884452").split(",")
+    if isbn.strip()
+]
+
+# Seconds between two passes over the watchlist; shorter than the shortest
+# store TTL, so an entry is never expired for long
+WATCHLIST_INTERVAL = float(os.environ.get("BOOK_COMPARATOR_WATCHLIST_INTERVAL", "60"))
+
+# Watchlist ISBNs looked up at the same time (each one queries every store)
+WATCHLIST_CONCURRENCY = 2
+
+
+class BackgroundRefresher:
+    """
+    Run refreshes on a bounded pool of threads, at most one per key.
+
+    A refresh submitted while the same key is still queued or running is
+    dropped, so a popular stale entry is refreshed once however many
+    searches find it.
+    """
+
+    def __init__(self, max_workers=REFRESH_CONCURRENCY):
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="cache-refresh"
+        )
+        self._lock = threading.Lock()
+        self._pending = set()
+
+    def submit(self, key, func, *args):
+        """Queue `func(*args)` unless a refresh for `key` is pending. Returns whether it was queued."""
+        with self._lock:
+            if key in self._pending:
+                return False
+            self._pending.add(key)
+        BACKGROUND_REFRESHES.inc()
+        future = self._executor.submit(func, *args)
+        future.add_done_callback(lambda _: self._finish(key))
+        return True
+
+    def _finish(self, key):
+        with self._lock:
+            self._pending.discard(key)
+
+    def pending(self):
+        """Number of refreshes queued or running."""
+        with self._lock:
+            return len(self._pending)
+
+
+_refresher = None
+_refresher_lock = threading.Lock()
+
+
+def get_refresher():
+    """Return the process-wide background refresher."""
+    global _refresher
+    if _refresher is None:
+        with _refresher_lock:
+            if _refresher is None:
+                _refresher = BackgroundRefresher()
+    return _refresher
+
+
+class WatchlistPrewarmer:
+    """
+    Look every watchlist ISBN up every `interval` seconds, `concurrency` at a
+    time, from a daemon thread.
+
+    `search(isbn)` should be a cached search: stores with a fresh cached
+    result cost nothing, and the others are fetched and written back.
+    """
+
+    def __init__(self, search, isbns=None, interval=WATCHLIST_INTERVAL, concurrency=WATCHLIST_CONCURRENCY):
+        self.search = search
+        self.isbns = list(WATCHLIST if isbns is None else isbns)
+        self.interval = interval
+        self.concurrency = concurrency
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _warm(self, isbn):
+        try:
+            self.search(isbn)
+            return True
+        except Exception:
+            # A failing ISBN must not stop the others from being refreshed
+            return False
+
+    def run_once(self):
+        """Look the whole watchlist up once. Returns how many ISBNs were refreshed."""
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.concurrency, thread_name_prefix="watchlist"
+        ) as executor:
+            return sum(executor.map(self._warm, self.isbns))
+
+    def run_forever(self):
+        while not self._stop.is_set():
+            self.run_once()
+            self._stop.wait(self.interval)
+
+    def start(self):
+        if self._thread is None and self.isbns:
+            self._thread = threading.Thread(target=self.run_forever, name="watchlist-prewarmer", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+
+_prewarmer = None
+_prewarmer_lock = threading.Lock()
+
+
+def start_watchlist_prewarmer(search, isbns=None, interval=WATCHLIST_INTERVAL, concurrency=WATCHLIST_CONCURRENCY):
+    """Start keeping the watchlist warm with `search`, once per process. Returns the prewarmer."""
+    global _prewarmer
+    with _prewarmer_lock:
+        if _prewarmer is None:
+            _prewarmer = WatchlistPrewarmer(search, isbns, interval, concurrency).start()
+    return _prewarmer
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mantiene al día la caché de una lista de ISBN populares.")
+    parser.add_argument("isbns", nargs="*", help=f"ISBN a mantener al día (por defecto: {','.join(WATCHLIST)})")
+    parser.add_argument("--interval", type=float, default=WATCHLIST_INTERVAL, help="Segundos entre dos pasadas")
+    parser.add_argument("--concurrency", type=int, default=WATCHLIST_CONCURRENCY, help="ISBN consultados a la vez")
+    parser.add_argument("--once", action="store_true", help="Hacer una sola pasada y salir")
+    args = parser.parse_args(argv)
+
+    scrapers = configured_scrapers()
+
+    def search(isbn):
+        return search_isbn(isbn, scrapers, store_urls=STORE_URLS, cache=get_result_cache(),
+                           flights=get_store_lookups(), scheduler=get_scheduler(), history=get_price_history())
+
+    prewarmer = WatchlistPrewarmer(search, args.isbns or None, args.interval, args.concurrency)
+    if args.once:
+        refreshed = prewarmer.run_once()
+        print(f"{refreshed}/{len(prewarmer.isbns)} ISBN actualizados", file=sys.stderr)
+        return 0 if refreshed == len(prewarmer.isbns) else 1
+    try:
+        prewarmer.run_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,272 @@
+import threading
+import time
+
+from src.stores import STORE_URLS
+
+# (requests per second, burst) allowed against each store
+DEFAULT_RATE_LIMIT = (2.0, 5)
+STORE_RATE_LIMITS = {
+    "Amazon": (1.0, 3),
+    "Casa del Libro": (2.0, 5),
+    "eBay": (2.0, 5),
+    "El Corte Inglés": (1.0, 3),
+    "IberLibro": (2.0, 5),
+    "Librería Central": (1.0, 3),
+}
+
+# Consecutive failures that open a store's circuit, and seconds it stays open
+# before a single probe request is let through
+FAILURE_THRESHOLD = 5
+RESET_TIMEOUT = 30.0
+
+# Bounds of the per-store concurrency limit, and the latency (seconds) above
+# which the limit is cut back
+MIN_CONCURRENCY = 1
+MAX_CONCURRENCY = 8
+INITIAL_CONCURRENCY = 2
+TARGET_LATENCY = 2.0
+
+# Seconds a lookup may wait for a rate-limit token or a concurrency slot
+ACQUIRE_TIMEOUT = 5.0
+
+
+class StoreUnavailable(Exception):
+    """Raised instead of calling a store that is failing or saturated."""
+
+
+class TokenBucket:
+    """Token-bucket rate limiter: `rate` tokens per second, up to `capacity`."""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, timeout=ACQUIRE_TIMEOUT):
+        """Take one token, waiting up to `timeout` seconds. Returns False on timeout."""
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = (1 - self._tokens) / self.rate
+            if now + wait > deadline:
+                return False
+            time.sleep(wait)
+
+
+class CircuitBreaker:
+    """
+    Stop calling a store after repeated failures.
+
+    Closed: calls go through. After `failure_threshold` consecutive failures
+    the circuit opens and calls are rejected for `reset_timeout` seconds; then
+    it half-opens and lets one probe through, closing again if it succeeds and
+    re-opening if it fails.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold=FAILURE_THRESHOLD, reset_timeout=RESET_TIMEOUT):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self._opened_until = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """Whether a call may go through now."""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN:
+                if time.monotonic() < self._opened_until:
+                    return False
+                self.state = self.HALF_OPEN
+                self._probing = False
+            # Half-open: a single probe at a time
+            if self._probing:
+                return False
+            self._probing = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._probing = False
+
+    def release_probe(self):
+        """Let another call probe a half-open circuit when this one was never made."""
+        with self._lock:
+            self._probing = False
+
+    def record_failure(self, open_for=None):
+        """
+        Count a failure. `open_for` opens the circuit right away for that many
+        seconds, e.g. when the store answered 429 with a Retry-After header.
+        """
+        with self._lock:
+            self.failures += 1
+            self._probing = False
+            if open_for is not None or self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self._opened_until = time.monotonic() + (self.reset_timeout if open_for is None else open_for)
+
+
+class AdaptiveLimiter:
+    """
+    Concurrency limit that adapts to a store's observed latency (AIMD).
+
+    Each fast success raises the limit by about one per round of calls, while a
+    failure or a call slower than `target_latency` cuts it by 30%, so slow or
+    struggling stores get fewer sockets and healthy ones get more.
+    """
+
+    def __init__(self, initial=INITIAL_CONCURRENCY, minimum=MIN_CONCURRENCY, maximum=MAX_CONCURRENCY,
+                 target_latency=TARGET_LATENCY):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.target_latency = target_latency
+        self.limit = float(initial)
+        self.in_flight = 0
+        self._cond = threading.Condition()
+
+    def acquire(self, timeout=ACQUIRE_TIMEOUT):
+        """Take a slot, waiting up to `timeout` seconds. Returns False on timeout."""
+        with self._cond:
+            if not self._cond.wait_for(lambda: self.in_flight < int(self.limit), timeout):
+                return False
+            self.in_flight += 1
+            return True
+
+    def release(self, latency=None, ok=True):
+        """Give the slot back; `latency` None means the call never reached the store."""
+        with self._cond:
+            self.in_flight -= 1
+            if latency is not None:
+                if ok and latency <= self.target_latency:
+                    self.limit = min(self.maximum, self.limit + 1 / self.limit)
+                else:
+                    self.limit = max(self.minimum, self.limit * 0.7)
+            self._cond.notify_all()
+
+
+def _retry_after(exc):
+    """Seconds asked for by a 429/503 response's Retry-After header, if any."""
+    response = getattr(exc, "response", None)
+    if response is None or response.status_code not in (429, 503):
+        return None
+    try:
+        return float(response.headers.get("Retry-After", RESET_TIMEOUT))
+    except ValueError:
+        return RESET_TIMEOUT
+
+
+class StorePolicy:
+    """Rate limit, circuit breaker and concurrency limit for one store."""
+
+    def __init__(self, rate, burst):
+        self.bucket = TokenBucket(rate, burst)
+        self.breaker = CircuitBreaker()
+        self.limiter = AdaptiveLimiter()
+
+    def call(self, func, *args, acquire_timeout=ACQUIRE_TIMEOUT):
+        """Call `func(*args)` within the store's limits, or raise StoreUnavailable."""
+        if not self.breaker.allow():
+            raise StoreUnavailable("Tienda no disponible temporalmente")
+
+        latency = None
+        ok = False
+        acquired = False
+        try:
+            if not self.limiter.acquire(acquire_timeout):
+                raise StoreUnavailable("Demasiadas consultas en curso")
+            acquired = True
+            if not self.bucket.acquire(acquire_timeout):
+                raise StoreUnavailable("Límite de consultas alcanzado")
+
+            start = time.monotonic()
+            try:
+                result = func(*args)
+            finally:
+                latency = time.monotonic() - start
+            ok = True
+            self.breaker.record_success()
+            return result
+        except StoreUnavailable:
+            # Not the store's fault: give a half-open probe back untried
+            self.breaker.release_probe()
+            raise
+        except Exception as e:
+            self.breaker.record_failure(_retry_after(e))
+            raise
+        finally:
+            if acquired:
+                self.limiter.release(latency, ok)
+
+
+class StoreScheduler:
+    """Put every store lookup behind its store's rate limit, breaker and limiter."""
+
+    def __init__(self, rate_limits=None):
+        rate_limits = STORE_RATE_LIMITS if rate_limits is None else rate_limits
+        self._lock = threading.Lock()
+        self._rate_limits = rate_limits
+        self.policies = {store: StorePolicy(*rate_limits.get(store, DEFAULT_RATE_LIMIT)) for store in STORE_URLS}
+
+    def policy(self, store_name):
+        with self._lock:
+            if store_name not in self.policies:
+                self.policies[store_name] = StorePolicy(*self._rate_limits.get(store_name, DEFAULT_RATE_LIMIT))
+            return self.policies[store_name]
+
+    def wrap(self, store_name, scraper_func, acquire_timeout=ACQUIRE_TIMEOUT):
+        """
+        Return a scraper that goes through the store's policy, waiting up to
+        `acquire_timeout` seconds for its rate limit and concurrency slots.
+        """
+        policy = self.policy(store_name)
+
+        def scheduled(isbn):
+            return policy.call(scraper_func, isbn, acquire_timeout=acquire_timeout)
+        return scheduled
+
+    def status(self):
+        """Breaker state, failures and concurrency limit of each store."""
+        return {
+            store: {
+                "state": policy.breaker.state,
+                "failures": policy.breaker.failures,
+                "concurrency": int(policy.limiter.limit),
+                "in_flight": policy.limiter.in_flight,
+            }
+            for store, policy in self.policies.items()
+        }
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler():
+    """Return the process-wide store scheduler."""
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = StoreScheduler()
+    return _scheduler
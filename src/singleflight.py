@@ -0,0 +1,67 @@
+import concurrent.futures
+import threading
+
+from src.metrics import LOOKUPS_COALESCED
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls for the same key into one in-flight call.
+
+    The first caller for a key runs the function; callers arriving while it is
+    still running wait for, and share, its result (or exception) instead of
+    running it again. Once the call finishes the key is released, so the next
+    call after that runs afresh.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    def do(self, key, func, *args, **kwargs):
+        """Run `func(*args, **kwargs)` unless a call for `key` is already in flight."""
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = concurrent.futures.Future()
+                self._calls[key] = future
+                self.calls += 1
+            else:
+                self.coalesced += 1
+                LOOKUPS_COALESCED.inc()
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = func(*args, **kwargs)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+    def in_flight(self):
+        """Number of keys with a call currently running."""
+        with self._lock:
+            return len(self._calls)
+
+    def stats(self):
+        """Calls actually run and calls that joined one already in flight."""
+        with self._lock:
+            return {"calls": self.calls, "coalesced": self.coalesced}
+
+
+_store_lookups = SingleFlight()
+
+
+def get_store_lookups():
+    """Return the process-wide single-flight group for (ISBN, store) lookups."""
+    return _store_lookups
@@ -0,0 +1,19 @@
+# Define base URLs for each store to construct product links
+STORE_URLS = {
+    "Amazon": "https://www.amazon.es/s?k={}",
+    "Casa del Libro": "https://www.casadellibro.com/?query={}",
+    "eBay": "https://www.ebay.es/sch/i.html?_nkw={}",
+    "El Corte Inglés": "https://www.elcorteingles.es/search-nwx/1/?s={}",
+    "IberLibro": "https://www.iberlibro.com/servlet/SearchResults?ds=20&kn={}&sts=t",
+    "Librería Central": "https://www.libreriacentral.com/SearchResults.aspx?st={}&cId=0&sm=qck"
+}
+
+# Store logo URLs for each store
+STORE_LOGOS = {
+    "Amazon": "https://upload.wikimedia.org/wikipedia/commons/thumb/a/a9/Amazon_logo.svg/320px-Amazon_logo.svg.png",
+    "Casa del Libro": "https://play-lh.googleusercontent.com/JBBNBwe7q7A-lBx1PDXQ6VprjsT_XxH4w8M0IM3d7rKtU0-Rubglmg_kuwIyPYn8mMY=w240-h480-rw",
+    "eBay": "https://upload.wikimedia.org/wikipedia/commons/thumb/1/1b/EBay_logo.svg/220px-EBay_logo.svg.png",
+    "El Corte Inglés": "https://banner2.cleanpng.com/20180531/jsz/avo5f3ffi.webp",
+    "IberLibro": "https://librosdeimpro.com/wp-content/uploads/2021/02/iberlibro.png",
+    "Librería Central": "https://www.libreriacentral.com/Resources/icons/Logob.png"
+}
@@ -0,0 +1,428 @@
+"""
+Streamlit user interface of the book price comparator. `streamlit_app.py`
+only calls `main()`; the page is built from here so that Streamlit's reruns
+reuse the already imported modules.
+
+pandas is imported only by the batch and metrics table code paths, which
+keeps the first page load light.
+"""
+import time
+
+# Start of the cold-start measurement reported as STARTUP_SECONDS
+_IMPORT_STARTED = time.perf_counter()
+
+import os
+import tempfile
+
+import streamlit as st
+
+# Store lookups go through plain-HTTP adapters (src.adapters) that share a
+# keep-alive connection pool, instead of launching a headless browser per store.
+from src.adapters import configured_scrapers
+from src.cache import get_result_cache
+from src.cards import GRID_CSS, card_fields, results_grid_html
+from src.charts import price_comparison_spec, price_history_spec
+from src.engine import iter_search_isbn, search_isbn
+from src.history import get_price_history
+from src.isbn import InvalidISBN, canonical_isbn
+from src.metrics import (BACKGROUND_REFRESHES, CACHE_REQUESTS, LOOKUPS_COALESCED, METRICS_HOST, METRICS_PORT,
+                         RENDER_SECONDS, STARTUP_SECONDS, STORE_LATENCY, STORE_LOOKUPS, STORE_REFUSALS,
+                         STORE_TIMEOUTS, start_metrics_server)
+from src.pricing import normalize_price
+from src.refresh import get_refresher, start_watchlist_prewarmer
+from src.scheduler import get_scheduler
+from src.singleflight import get_store_lookups
+from src.stores import STORE_URLS
+
+# Seconds between two redraws of the results grid while stores are answering
+GRID_REDRAW_INTERVAL = 0.25
+
+# Labels shown for each store status reported by the search engine
+STORE_STATUS_LABELS = {
+    "ok": "✅ Encontrado",
+    "not_found": "➖ No encontrado",
+    "error": "⚠️ Error",
+    "unavailable": "🚫 No disponible temporalmente",
+    "timeout": "⏱️ Tiempo agotado"
+}
+
+# Labels for the circuit breaker state of each store
+CIRCUIT_LABELS = {
+    "closed": "cerrado",
+    "open": "abierto",
+    "half_open": "semiabierto"
+}
+# One scraper per store, queried concurrently by the search engine.
+# BOOK_COMPARATOR_FIXTURES_URL points the adapters at a local fixture server
+# (python -m src.fixture_server) instead of the live sites.
+SCRAPERS = configured_scrapers()
+
+def summarize_search(store_results):
+    """
+    Split per-store results into what the results page shows: `results` only
+    holds the stores that returned a product, while `stores` reports the status
+    and latency of each store (including the ones that timed out).
+    """
+    results = [r for r in store_results if r['status'] == 'ok']
+    stores = {r['store']: {'status': r['status'], 'latency': r['latency']} for r in store_results}
+
+    # Add timestamp to results for display purposes: the oldest result shown
+    fetched_at = min(r['fetched_at'] for r in store_results) if store_results else time.time()
+    timestamp = time.strftime("%H:%M:%S", time.localtime(fetched_at))
+    return {"results": results, "stores": stores, "timestamp": timestamp}
+
+# Results are cached per (ISBN, store) in memory and on disk (src.cache), with a
+# TTL per store, so restarts and refreshes don't re-scrape every store at once.
+def cached_search_books(isbn):
+    """
+    Return search results for a given ISBN, from the result cache when possible.
+
+    Expired cached results are returned as they are and refreshed in the
+    background; stores with nothing cached are queried concurrently. The
+    results page uses `iter_search_isbn` directly to draw each store as it
+    answers.
+    """
+    store_results = search_isbn(isbn, SCRAPERS, store_urls=STORE_URLS, cache=get_result_cache(),
+                                flights=get_store_lookups(), scheduler=get_scheduler(),
+                                history=get_price_history(), refresher=get_refresher())
+    return summarize_search(store_results)
+
+def warm_isbn(isbn):
+    """Fetch every store whose cached result for `isbn` is missing or expired (watchlist pre-warming)."""
+    return search_isbn(isbn, SCRAPERS, store_urls=STORE_URLS, cache=get_result_cache(),
+                       flights=get_store_lookups(), scheduler=get_scheduler(), history=get_price_history())
+
+def render_results_grid(placeholder, results, isbn):
+    """Draw every result card into `placeholder`, as a single HTML element."""
+    cards = tuple(card_fields(result, isbn) for result in results)
+    placeholder.markdown(results_grid_html(cards), unsafe_allow_html=True)
+
+_startup_recorded = False
+
+def record_startup():
+    """Observe the cold-start time once per process, when the first page is drawn."""
+    global _startup_recorded
+    if not _startup_recorded:
+        _startup_recorded = True
+        STARTUP_SECONDS.observe(time.perf_counter() - _IMPORT_STARTED)
+
+def render_price_history(isbn, results):
+    """Show how each store's price has moved and how today's prices compare."""
+    history = get_price_history()
+    # Read from the daily aggregates, never from the raw price rows
+    daily = history.daily(isbn)
+    if not daily:
+        return
+
+    st.subheader("📈 Evolución del precio")
+    spec = price_history_spec(tuple((d['day'], d['store'], d['min'], d['avg'], d['max']) for d in daily))
+    st.vega_lite_chart(spec, width="stretch")
+
+    stats = history.stats(isbn)
+    for result in results:
+        store_stats = stats.get(result['store'])
+        price = result.get('numeric_price')
+        if not store_stats or price is None:
+            continue
+        line = (f"**{result['store']}:** mínimo {store_stats['min']:.2f}€, media {store_stats['avg']:.2f}€, "
+                f"máximo {store_stats['max']:.2f}€ ({store_stats['count']} precios registrados)")
+        if store_stats['count'] > 1 and price <= store_stats['min']:
+            line += " · 🟢 el precio más bajo registrado"
+        st.write(line)
+
+def render_metrics_panel():
+    """Show cache hit rates, per-store latency and failures, and render time."""
+    with st.expander("📈 Métricas de rendimiento"):
+        for tier, label in (("memory", "memoria"), ("disk", "disco")):
+            hits = CACHE_REQUESTS.value(tier=tier, result="hit")
+            stale = CACHE_REQUESTS.value(tier=tier, result="stale")
+            misses = CACHE_REQUESTS.value(tier=tier, result="miss")
+            total = hits + stale + misses
+            rate = f"{(hits + stale) / total:.0%}" if total else "—"
+            st.write(f"**Caché en {label}:** {hits} aciertos, {stale} caducados, {misses} fallos ({rate})")
+        st.write(f"**Consultas compartidas:** {LOOKUPS_COALESCED.value()}")
+        st.write(f"**Actualizaciones en segundo plano:** {BACKGROUND_REFRESHES.value()}")
+
+        rows = []
+        for store in STORE_URLS:
+            sent = STORE_LATENCY.count(store=store)
+            refused = STORE_REFUSALS.value(store=store)
+            if not sent and not refused:
+                continue
+            # A store whose every lookup was refused has no latency to show
+            p50 = round(STORE_LATENCY.quantile(0.5, store=store), 3) if sent else None
+            p95 = round(STORE_LATENCY.quantile(0.95, store=store), 3) if sent else None
+            rows.append({
+                "Tienda": store,
+                "Consultas": sent,
+                "p50 (s)": p50,
+                "p95 (s)": p95,
+                "Errores": STORE_LOOKUPS.value(store=store, status="error"),
+                "Agotadas": STORE_TIMEOUTS.value(store=store),
+                "Rechazadas": refused,
+            })
+        if rows:
+            import pandas as pd
+
+            st.dataframe(pd.DataFrame(rows), hide_index=True)
+
+        render_mean = RENDER_SECONDS.mean()
+        if render_mean is not None:
+            st.write(f"**Dibujo de resultados:** {render_mean * 1000:.0f} ms de media "
+                     f"({RENDER_SECONDS.count()} búsquedas)")
+        if STARTUP_SECONDS.count():
+            st.write(f"**Arranque:** {STARTUP_SECONDS.mean() * 1000:.0f} ms")
+        if METRICS_PORT:
+            st.caption(f"Prometheus: http://{METRICS_HOST}:{METRICS_PORT}/metrics")
+
+def render_batch_mode():
+    """Compare a whole list of ISBNs uploaded as a file and offer the result for download."""
+    with st.expander("📦 Comparación masiva (lista de ISBN)"):
+        uploaded = st.file_uploader("Fichero con un ISBN por línea (.txt o .csv)", type=["txt", "csv"])
+        output_format = st.radio("Formato de salida", ["csv", "parquet"], horizontal=True)
+        if uploaded is None or not st.button("▶️ Comparar lista"):
+            return
+
+        # The batch path needs pandas; import it only when a list is compared
+        from src.batch import describe_failed, iter_isbns, run_batch
+
+        lines = uploaded.getvalue().splitlines()
+        invalid = []
+        total = sum(1 for _ in iter_isbns(lines, invalid))
+        if invalid:
+            st.warning(f"Se omiten {len(invalid)} ISBN no válidos: {', '.join(invalid[:10])}")
+        if not total:
+            st.error("El fichero no contiene ningún ISBN válido.")
+            return
+
+        progress = st.progress(0)
+        step = max(1, total // 100)
+
+        def report(done):
+            if done % step == 0 or done == total:
+                progress.progress(done / total, text=f"{done}/{total} ISBN")
+
+        # The sinks write to a path; the file is read back for the download
+        # and removed with its directory, so runs leave nothing on disk
+        with tempfile.TemporaryDirectory(prefix="book-comparator-batch-") as tmpdir:
+            output_path = os.path.join(tmpdir, f"comparativa_precios.{output_format}")
+            failed = []
+            run_batch(iter_isbns(lines), output_path, scrapers=SCRAPERS, output_format=output_format,
+                      on_progress=report, failed=failed)
+            with open(output_path, "rb") as f:
+                data = f.read()
+        if failed:
+            st.warning(f"{len(failed)} consultas sin respuesta de la tienda: {describe_failed(failed)}")
+
+        st.download_button(
+            "⬇️ Descargar resultados",
+            data,
+            file_name=f"comparativa_precios.{output_format}",
+            mime="text/csv" if output_format == "csv" else "application/octet-stream",
+        )
+
+def main():
+    start_metrics_server()
+    start_watchlist_prewarmer(warm_isbn)
+    
+    st.title("📚 Comparador de Precios de Libros")
+    st.write("Introduce un ISBN para comparar precios de libros en diferentes tiendas online.")
+
+    # Initialize session state for tracking if search was triggered by Enter key
+    if 'isbn_search_triggered' not in st.session_state:
+        st.session_state['isbn_search_triggered'] = False
+        
+    # Track the previous ISBN to detect changes
+    if 'previous_isbn' not in st.session_state:
+        st.session_state['previous_isbn'] = "9788478884452"  # Initialize with the default ISBN
+
+    # Get the ISBN input
+    isbn = st.text_input("ISBN (10-13 dígitos):", value="9788478884452", max_chars=17, key="isbn_input")
+    
+    # Check if Enter was pressed (ISBN changed) - but only if not the first load
+    if 'app_loaded' in st.session_state and isbn != st.session_state['previous_isbn']:
+        st.session_state['isbn_search_triggered'] = True
+    
+    # Update previous ISBN
+    st.session_state['previous_isbn'] = isbn
+    
+    # Mark that the app has been loaded
+    st.session_state['app_loaded'] = True
+    
+    # Add search button to explicitly trigger the search
+    search_button = st.button("🔍 Buscar")
+    
+    # Add refresh button in sidebar
+    with st.sidebar:
+        st.title("Opciones")
+        refresh_store = st.selectbox("Tienda a actualizar", ["Todas"] + list(STORE_URLS))
+        if st.button("🔄 Actualizar precios"):
+            # Clear the cache for this specific ISBN (and store, if one was chosen)
+            try:
+                get_result_cache().invalidate(isbn=canonical_isbn(isbn),
+                                              store=None if refresh_store == "Todas" else refresh_store)
+                st.success("¡Cache borrado! Los precios se actualizarán.")
+            except InvalidISBN as e:
+                st.error(f"ISBN no válido. {e}")
+            
+        st.markdown("---")
+        st.write("Utiliza este botón para obtener los precios más actualizados.")
+        
+        render_metrics_panel()
+        
+        # Add information about deployment
+        st.markdown("---")
+        st.subheader("Acerca de la app")
+        st.write("Esta aplicación está desplegada en Streamlit Community Cloud.")
+        st.write("Compara precios de libros en varias tiendas online usando el ISBN.")
+        
+        # GitHub link if you have one
+        # st.write("[Código fuente en GitHub](https://github.com/your-username/your-repo)")
+
+    render_batch_mode()
+    record_startup()
+
+    # Only search when the button is pressed or when Enter is pressed in the input field
+    if search_button or st.session_state.get('isbn_search_triggered', False):
+        # Reset the search trigger flag
+        st.session_state['isbn_search_triggered'] = False
+        
+        # Hyphens, spaces and ISBN-10s are accepted; everything below uses the
+        # canonical ISBN-13, so both forms of a book share cache and history
+        try:
+            isbn = canonical_isbn(isbn)
+        except InvalidISBN as e:
+            st.error(f"ISBN no válido. {e}")
+            return
+
+        st.write(f"Buscando ISBN: **{isbn}**")
+        
+        # Create a progress element that tracks how many stores have answered
+        total_stores = len(SCRAPERS)
+        progress = st.progress(0, text=f"0/{total_stores} tiendas")
+        
+        # Check cache status for visual feedback
+        cache_status = st.empty()
+        cache_status.info("🔍 Buscando en tiendas online...")
+        
+        # Display results in a nice grid
+        st.subheader("Resultados de la comparación")
+        
+        # The whole grid is one HTML element, replaced as the stores answer
+        st.markdown(GRID_CSS, unsafe_allow_html=True)
+        grid = st.empty()
+        
+        store_results = []
+        results = []
+        drawn, drawn_at = 0, float("-inf")
+        render_time = 0.0
+        lookups = iter_search_isbn(isbn, SCRAPERS, store_urls=STORE_URLS, cache=get_result_cache(),
+                                   flights=get_store_lookups(), scheduler=get_scheduler(),
+                                   history=get_price_history(), refresher=get_refresher(),
+                                   heartbeat=GRID_REDRAW_INTERVAL)
+        for result in lookups:
+            # None: the cached results are all out, or no store answered for
+            # a while; draw whatever was held back
+            if result is None:
+                if drawn != len(results):
+                    render_start = time.perf_counter()
+                    render_results_grid(grid, results, isbn)
+                    drawn, drawn_at = len(results), time.perf_counter()
+                    render_time += drawn_at - render_start
+                continue
+            store_results.append(result)
+            if not result.get('cached'):
+                progress.progress(len(store_results) / total_stores,
+                                  text=f"{len(store_results)}/{total_stores} tiendas")
+            if result['status'] != 'ok':
+                continue
+            
+            # Convert prices to numeric values for comparison if not already present
+            if 'numeric_price' not in result:
+                result['numeric_price'] = normalize_price(result.get('price', 'N/A'))
+            results.append(result)
+            
+            # Cached results arrive all at once and stores often answer close
+            # together: redraw at most every GRID_REDRAW_INTERVAL; held-back
+            # results are drawn on the next heartbeat, or at the end
+            if result.get('cached') or time.perf_counter() - drawn_at < GRID_REDRAW_INTERVAL:
+                continue
+            render_start = time.perf_counter()
+            render_results_grid(grid, results, isbn)
+            drawn, drawn_at = len(results), time.perf_counter()
+            render_time += drawn_at - render_start
+        
+        progress.empty()
+        render_start = time.perf_counter()
+        if drawn != len(results):
+            render_results_grid(grid, results, isbn)
+        render_time += time.perf_counter() - render_start
+        
+        prices = [r['numeric_price'] for r in results if r.get('numeric_price') is not None]
+        lowest_price = min(prices) if prices else None
+        
+        search_data = summarize_search(store_results)
+        timestamp = search_data["timestamp"]
+        
+        # Display timestamp of when the data was fetched, and how much of it
+        # actually came from the result cache
+        cached = sum(1 for r in store_results if r.get('cached'))
+        if cached and cached == len(store_results):
+            cache_note = " (desde caché)"
+        elif cached:
+            cache_note = f" ({cached} de {len(store_results)} tiendas desde caché)"
+        else:
+            cache_note = ""
+        stale = sum(1 for r in store_results if r.get('stale'))
+        if stale:
+            cache_note += f" · actualizando {stale} en segundo plano"
+        cache_status.info(f"📊 Datos actualizados a las {timestamp}" + cache_note)
+        
+        # Show how each store answered and how long it took
+        with st.expander("Estado de las tiendas"):
+            scheduler_status = get_scheduler().status()
+            lines = []
+            for store, info in search_data.get("stores", {}).items():
+                label = STORE_STATUS_LABELS.get(info['status'], info['status'])
+                line = f"**{store}:** {label} ({info['latency']:.2f} s)"
+                policy = scheduler_status.get(store)
+                if policy:
+                    line += f" · circuito {CIRCUIT_LABELS[policy['state']]}, hasta {policy['concurrency']} consultas a la vez"
+                lines.append(line)
+            st.markdown("  \n".join(lines))
+        
+        if not results:
+            st.error("No se encontraron resultados para este ISBN.")
+            return
+        
+        # Create a bar chart for price comparison
+        render_start = time.perf_counter()
+        st.subheader("Comparativa visual de precios")
+        
+        # The chart spec is memoized by the (store, price) pairs, so reruns of
+        # the same search send the same small Vega-Lite spec
+        prices = tuple((r['store'], r['numeric_price']) for r in results if r.get('numeric_price') is not None)
+        
+        if prices:
+            st.vega_lite_chart(price_comparison_spec(prices), width="stretch")
+            
+            # Show savings information
+            if lowest_price is not None and len(prices) > 1:
+                avg_price = sum(price for _, price in prices) / len(prices)
+                max_price = max(price for _, price in prices)
+                
+                savings_avg = avg_price - lowest_price
+                savings_max = max_price - lowest_price
+                
+                percent_avg = (savings_avg / avg_price) * 100
+                percent_max = (savings_max / max_price) * 100
+                
+                st.subheader("💰 Ahorro potencial")
+                st.write(f"Ahorro respecto al precio medio: **{savings_avg:.2f}€ ({percent_avg:.2f}%)**")
+                st.write(f"Ahorro respecto al precio máximo: **{savings_max:.2f}€ ({percent_max:.2f}%)**")
+        else:
+            st.warning("No hay suficientes datos de precios para generar una comparativa visual.")
+        
+        render_price_history(isbn, results)
+        
+        RENDER_SECONDS.observe(render_time + time.perf_counter() - render_start)
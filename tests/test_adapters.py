@@ -0,0 +1,55 @@
+"""The store adapters against the saved pages served by the fixture server."""
+import pytest
+
+from src.adapters import build_adapters
+from src.fixture_server import FIXTURE_FILES, fixture_store_urls, start_fixture_server
+
+ISBN = "9788478884452"
+
+# (title, price, product URL path on the fixture server, or an absolute URL)
+EXPECTED = {
+    "Amazon": ("Harry Potter y la Piedra Filosofal", "17,95\u00a0€",
+               "/Harry-Potter-Piedra-Filosofal-Rowling/dp/8478884459"),
+    "Casa del Libro": ("Harry Potter y la Piedra Filosofal", "18,95 €",
+                       "/libro-harry-potter-y-la-piedra-filosofal/9788478884452/599400"),
+    # Marketplaces: the offer with the lowest price plus shipping
+    "eBay": ("HARRY POTTER PIEDRA FILOSOFAL tapa dura", "9,00 EUR", "https://www.ebay.es/itm/1234567892"),
+    "El Corte Inglés": ("Harry Potter y la Piedra Filosofal (tapa dura)", "19,90 €",
+                        "/libros/A37733796-harry-potter-y-la-piedra-filosofal-tapa-dura/"),
+    "IberLibro": ("Harry Potter y la piedra filosofal", "EUR 17,10", "/servlet/BookDetailsPL?bi=31245678902"),
+    "Librería Central": ("Harry Potter y la piedra filosofal", "18,05 €",
+                         "/libro/harry-potter-y-la-piedra-filosofal_599400"),
+}
+
+
+@pytest.fixture(scope="module")
+def base_url():
+    server, base_url = start_fixture_server("127.0.0.1")
+    yield base_url
+    server.shutdown()
+    server.server_close()
+
+
+def test_every_store_has_a_fixture_and_an_expectation():
+    assert set(EXPECTED) == set(FIXTURE_FILES)
+
+
+@pytest.mark.parametrize("store_name", sorted(EXPECTED))
+def test_adapter_reads_fixture(base_url, store_name):
+    adapter = build_adapters(fixture_store_urls(base_url))[store_name]
+    title, price, url = EXPECTED[store_name]
+
+    result = adapter(ISBN)
+
+    assert result['store'] == store_name
+    assert result['isbn'] == ISBN
+    assert result['title'] == title
+    assert result['price'] == price
+    assert result['product_url'] == (url if url.startswith("http") else base_url + url)
+
+
+@pytest.mark.parametrize("store_name", sorted(EXPECTED))
+def test_adapter_without_results_returns_none(base_url, store_name):
+    # Paths that aren't a store's are answered with empty.html
+    adapter = build_adapters({store_name: f"{base_url}/no-such-store?q={{}}"})[store_name]
+    assert adapter(ISBN) is None
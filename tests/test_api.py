@@ -0,0 +1,12 @@
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_importing_the_api_does_not_load_pandas():
+    # In a fresh interpreter: this one has pandas loaded by other tests
+    code = "import sys, src.api; print(sorted(m for m in ('pandas', 'pyarrow') if m in sys.modules))"
+    output = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert output.stdout.strip() == "[]"
@@ -0,0 +1,161 @@
+import pytest
+
+from src import cache as cache_module
+from src.cache import LRUCache, ResultCache
+
+ISBN = "9788478884452"
+OTHER_ISBN = "9780804429573"
+
+
+class Clock:
+    """Stands in for the `time` module in src.cache, so TTLs pass without waiting."""
+
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache_module, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def cache(clock):
+    cache = ResultCache(":memory:", ttls={"Amazon": 100, "eBay": 10}, default_ttl=50, stale_ttl=1000)
+    yield cache
+    cache.close()
+
+
+def result(price="10,00 €", store="Amazon"):
+    return {'isbn': ISBN, 'store': store, 'status': 'ok', 'price': price}
+
+
+def test_miss_then_hit(cache):
+    assert cache.get(ISBN, "Amazon") is None
+    cache.set(ISBN, "Amazon", result())
+    assert cache.get(ISBN, "Amazon") == dict(result(), cached="memory")
+
+
+def test_cached_markers_are_not_stored(cache):
+    cache.set(ISBN, "Amazon", dict(result(), cached="disk", stale=True))
+    assert cache.get(ISBN, "Amazon") == dict(result(), cached="memory")
+
+
+def test_per_store_ttl(cache, clock):
+    cache.set(ISBN, "Amazon", result())
+    cache.set(ISBN, "eBay", result(store="eBay"))
+    cache.set(ISBN, "IberLibro", result(store="IberLibro"))
+
+    clock.now += 20
+    assert cache.get(ISBN, "Amazon") is not None
+    assert cache.get(ISBN, "eBay") is None
+    assert cache.get(ISBN, "IberLibro") is not None
+
+    clock.now += 40
+    assert cache.get(ISBN, "Amazon") is not None
+    assert cache.get(ISBN, "IberLibro") is None
+
+
+def test_stale_results_only_when_allowed(cache, clock):
+    cache.set(ISBN, "eBay", result(store="eBay"))
+    clock.now += 11
+
+    assert cache.get(ISBN, "eBay") is None
+    stale = cache.get(ISBN, "eBay", allow_stale=True)
+    assert stale['stale'] is True
+    assert stale['price'] == "10,00 €"
+
+    # Past the stale window, not even a stale result is kept
+    clock.now += 1000
+    assert cache.get(ISBN, "eBay", allow_stale=True) is None
+
+
+def test_disk_tier_answers_and_promotes(tmp_path, clock):
+    path = str(tmp_path / "results.sqlite3")
+    first = ResultCache(path)
+    first.set(ISBN, "Amazon", result())
+    first.close()
+
+    # A new process: empty memory tier, same file
+    second = ResultCache(path)
+    assert second.get(ISBN, "Amazon") == dict(result(), cached="disk")
+    assert second.get(ISBN, "Amazon") == dict(result(), cached="memory")
+    second.close()
+
+
+def test_disk_tier_expires_too(tmp_path, clock):
+    path = str(tmp_path / "results.sqlite3")
+    first = ResultCache(path, ttls={"Amazon": 100}, stale_ttl=1000)
+    first.set(ISBN, "Amazon", result())
+    first.close()
+
+    second = ResultCache(path, ttls={"Amazon": 100}, stale_ttl=1000)
+    clock.now += 101
+    assert second.get(ISBN, "Amazon") is None
+    assert second.get(ISBN, "Amazon", allow_stale=True)['cached'] == "disk"
+    clock.now += 1000
+    assert second.get(ISBN, "Amazon", allow_stale=True) is None
+    second.close()
+
+
+@pytest.mark.parametrize("kwargs, left", [
+    ({'isbn': ISBN}, {(OTHER_ISBN, "Amazon"), (OTHER_ISBN, "eBay")}),
+    ({'store': "Amazon"}, {(ISBN, "eBay"), (OTHER_ISBN, "eBay")}),
+    ({'isbn': ISBN, 'store': "Amazon"}, {(ISBN, "eBay"), (OTHER_ISBN, "Amazon"), (OTHER_ISBN, "eBay")}),
+    ({}, set()),
+])
+def test_invalidate(tmp_path, clock, kwargs, left):
+    path = str(tmp_path / "results.sqlite3")
+    cache = ResultCache(path)
+    keys = {(isbn, store) for isbn in (ISBN, OTHER_ISBN) for store in ("Amazon", "eBay")}
+    for isbn, store in keys:
+        cache.set(isbn, store, result(store=store))
+
+    cache.invalidate(**kwargs)
+
+    assert {key for key in keys if cache.get(*key) is not None} == left
+    # Gone from the disk tier as well, not only from memory
+    reopened = ResultCache(path)
+    assert {key for key in keys if reopened.get(*key) is not None} == left
+    reopened.close()
+    cache.close()
+
+
+def test_lru_evicts_least_recently_used():
+    lru = LRUCache(maxsize=2)
+    lru.set("a", 1, expires_at=float("inf"))
+    lru.set("b", 2, expires_at=float("inf"))
+    assert lru.get("a") == 1
+
+    lru.set("c", 3, expires_at=float("inf"))
+
+    assert lru.get("b") is None
+    assert lru.get("a") == 1
+    assert lru.get("c") == 3
+    assert len(lru) == 2
+
+
+def test_memory_eviction_falls_back_to_disk(clock):
+    cache = ResultCache(":memory:", memory_size=1)
+    cache.set(ISBN, "Amazon", result())
+    cache.set(ISBN, "eBay", result(store="eBay"))
+
+    assert cache.get(ISBN, "Amazon")['cached'] == "disk"
+    cache.close()
+
+
+def test_disk_keeps_the_newest_rows(clock):
+    cache = ResultCache(":memory:", memory_size=1, disk_size=10)
+    isbns = [f"978{i:010d}" for i in range(100)]
+    for isbn in isbns:
+        clock.now += 1
+        cache.set(isbn, "Amazon", result())
+
+    # The size bound is enforced every 100 writes
+    assert [isbn for isbn in isbns if cache.get(isbn, "Amazon") is not None] == isbns[-10:]
+    cache.close()
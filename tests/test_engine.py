@@ -0,0 +1,125 @@
+import threading
+import time
+
+import pytest
+
+from src.cache import ResultCache
+from src.engine import iter_search_isbn, search_stores
+from src.singleflight import SingleFlight
+
+ISBN = "9788478884452"
+
+
+@pytest.fixture
+def release():
+    """Event the slow scrapers wait on, set at teardown so their threads finish."""
+    event = threading.Event()
+    yield event
+    event.set()
+
+
+def found(isbn):
+    return {'title': "Harry Potter", 'price': "10,00 €"}
+
+
+def slow_scraper(release):
+    def scraper(isbn):
+        release.wait(10)
+        return found(isbn)
+    return scraper
+
+
+def test_result_statuses():
+    def missing(isbn):
+        return None
+
+    def broken(isbn):
+        raise ConnectionError("store down")
+
+    results = search_stores(ISBN, {"Amazon": found, "eBay": missing, "IberLibro": broken})
+
+    assert [r['store'] for r in results] == ["Amazon", "eBay", "IberLibro"]
+    assert [r['status'] for r in results] == ['ok', 'not_found', 'error']
+    assert all(r['latency'] >= 0 for r in results)
+
+
+def test_store_timeout(release):
+    start = time.perf_counter()
+    results = search_stores(ISBN, {"Amazon": found, "eBay": slow_scraper(release)},
+                            store_timeout=0.2, deadline=5)
+    elapsed = time.perf_counter() - start
+
+    assert [r['status'] for r in results] == ['ok', 'timeout']
+    assert elapsed < 2
+
+
+def test_deadline(release):
+    start = time.perf_counter()
+    results = search_stores(ISBN, {"Amazon": found, "eBay": slow_scraper(release)},
+                            store_timeout=5, deadline=0.2)
+    elapsed = time.perf_counter() - start
+
+    assert [r['status'] for r in results] == ['ok', 'timeout']
+    assert elapsed < 2
+
+
+def test_results_arrive_as_stores_answer(release):
+    lookups = iter_search_isbn(ISBN, {"eBay": slow_scraper(release), "Amazon": found}, store_timeout=5)
+
+    assert next(lookups)['store'] == "Amazon"
+    release.set()
+    assert next(lookups)['store'] == "eBay"
+
+
+def test_heartbeat_while_waiting(release):
+    lookups = iter_search_isbn(ISBN, {"eBay": slow_scraper(release)}, store_timeout=5, heartbeat=0.05)
+
+    assert next(lookups) is None
+    release.set()
+    assert [r for r in lookups if r is not None][0]['status'] == 'ok'
+
+
+def test_only_definitive_answers_are_cached():
+    cache = ResultCache(":memory:")
+
+    def broken(isbn):
+        raise ConnectionError("store down")
+
+    list(iter_search_isbn(ISBN, {"Amazon": found, "eBay": broken}, cache=cache))
+
+    assert cache.get(ISBN, "Amazon")['status'] == 'ok'
+    assert cache.get(ISBN, "eBay") is None
+    cache.close()
+
+
+def test_cached_results_come_first_without_a_request():
+    cache = ResultCache(":memory:")
+    cache.set(ISBN, "Amazon", dict(found(ISBN), isbn=ISBN, store="Amazon", status='ok'))
+    requests = []
+
+    def scraper(isbn):
+        requests.append(isbn)
+        return found(isbn)
+
+    results = list(iter_search_isbn("84-7888-445-9", {"Amazon": scraper, "eBay": scraper}, cache=cache))
+
+    assert [(r['store'], r.get('cached')) for r in results] == [("Amazon", "memory"), ("eBay", None)]
+    assert requests == [ISBN]
+    cache.close()
+
+
+def test_answer_cached_while_scheduled_is_not_marked_cached():
+    cache = ResultCache(":memory:")
+
+    class LateFlights(SingleFlight):
+        """Another lookup answers for the store just before this one runs."""
+
+        def do(self, key, func, *args):
+            cache.set(*key, dict(found(ISBN), isbn=ISBN, store="Amazon", status='ok'))
+            return super().do(key, func, *args)
+
+    results = list(iter_search_isbn(ISBN, {"Amazon": found}, cache=cache, flights=LateFlights()))
+
+    assert results[0]['status'] == 'ok'
+    assert 'cached' not in results[0]
+    cache.close()
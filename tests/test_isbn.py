@@ -0,0 +1,66 @@
+import pytest
+
+from src.isbn import (
+    InvalidISBN,
+    canonical_isbn,
+    isbn10_check_digit,
+    isbn10_to_isbn13,
+    isbn13_check_digit,
+    isbn13_to_isbn10,
+    is_valid_isbn10,
+    is_valid_isbn13,
+)
+
+
+def test_check_digits():
+    assert isbn10_check_digit("847888445") == "9"
+    assert isbn10_check_digit("080442957") == "X"
+    assert isbn13_check_digit("978847888445") == "2"
+    assert isbn13_check_digit("978080442957") == "3"
+
+
+def test_validation():
+    assert is_valid_isbn10("8478884459")
+    assert is_valid_isbn10("080442957X")
+    assert not is_valid_isbn10("8478884456")
+    assert not is_valid_isbn10("X478884459")
+    assert is_valid_isbn13("9788478884452")
+    assert not is_valid_isbn13("9788478884453")
+
+
+def test_conversion():
+    assert isbn10_to_isbn13("8478884459") == "9788478884452"
+    assert isbn10_to_isbn13("080442957X") == "9780804429573"
+    assert isbn13_to_isbn10("9788478884452") == "8478884459"
+    assert isbn13_to_isbn10("9780804429573") == "080442957X"
+    # 979 ISBNs have no ISBN-10
+    assert isbn13_to_isbn10("9791032300824") is None
+
+
+@pytest.mark.parametrize("text", [
+    "9788478884452",
+    "978-84-7888-445-2",
+    "978 84 7888 445 2",
+    "8478884459",
+    "84-7888-445-9",
+    9788478884452,
+])
+def test_canonical_isbn(text):
+    assert canonical_isbn(text) == "9788478884452"
+
+
+def test_canonical_isbn_lowercase_x():
+    assert canonical_isbn("0-8044-2957-x") == "9780804429573"
+
+
+@pytest.mark.parametrize("text", [
+    "8478884456",       # wrong ISBN-10 check digit
+    "9788478884453",    # wrong ISBN-13 check digit
+    "84788844X9",       # X only as the check digit
+    "1238478884452",    # neither 978 nor 979
+    "97884788844",      # wrong length
+    "",
+])
+def test_canonical_isbn_rejects(text):
+    with pytest.raises(InvalidISBN):
+        canonical_isbn(text)
@@ -0,0 +1,72 @@
+import math
+
+import pytest
+
+from src import pricing
+from src.pricing import detect_currency, normalize_price, normalize_prices, parse_prices
+
+# Raw store prices and the amount each one stands for
+PRICES = [
+    ("17,95 €", 17.95),
+    ("17,95\u00a0€", 17.95),
+    ("EUR 15,90", 15.9),
+    ("1.234,56 €", 1234.56),
+    ("1 234,56 €", 1234.56),
+    ("1\u00a0234,56 €", 1234.56),
+    ("1\u202f234,56 €", 1234.56),
+    ("EUR 1.250,00", 1250.0),
+    ("$1,250.00", 1250.0),
+    ("1,250", 1250.0),
+    ("1.250", 1250.0),
+    ("12.5", 12.5),
+    ("12 €", 12.0),
+    ("Desde 9,99 € + envío", 9.99),
+    ("No disponible", None),
+    ("Not Found", None),
+    ("", None),
+    (None, None),
+]
+
+
+@pytest.mark.parametrize("text, amount", PRICES)
+def test_normalize_price(text, amount):
+    assert normalize_price(text) == amount
+
+
+@pytest.mark.parametrize("arrow", [True, False], ids=["pyarrow", "pandas"])
+def test_normalize_prices_matches_normalize_price(monkeypatch, arrow):
+    if arrow:
+        pytest.importorskip("pyarrow")
+    else:
+        monkeypatch.setattr(pricing, "_arrow_compute", lambda: None)
+    texts = [text for text, _ in PRICES]
+
+    amounts = normalize_prices(texts)
+
+    assert amounts.dtype == "float64"
+    for (text, expected), amount in zip(PRICES, amounts):
+        if expected is None:
+            assert math.isnan(amount), text
+        else:
+            assert amount == expected, text
+
+
+def test_detect_currency():
+    assert detect_currency("17,95 €") == "EUR"
+    assert detect_currency("EUR 15,90") == "EUR"
+    assert detect_currency("US$ 12.00") == "USD"
+    assert detect_currency("$1,250.00") == "USD"
+    assert detect_currency("£8.99") == "GBP"
+    assert detect_currency("12,00") is None
+
+
+def test_parse_prices():
+    pd = pytest.importorskip("pandas")
+    prices = pd.Series(["1.234,56 €", "$1,250.00", "12,00"], index=["a", "b", "c"])
+
+    parsed = parse_prices(prices)
+
+    assert list(parsed.index) == ["a", "b", "c"]
+    assert list(parsed["amount"]) == [1234.56, 1250.0, 12.0]
+    assert parsed["currency"].tolist()[:2] == ["EUR", "USD"]
+    assert pd.isna(parsed["currency"]["c"])
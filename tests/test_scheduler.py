@@ -0,0 +1,103 @@
+import pytest
+
+from src.scheduler import CircuitBreaker, StorePolicy, StoreUnavailable
+
+
+def test_breaker_opens_after_threshold():
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=60)
+    for _ in range(2):
+        breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+
+
+def test_success_resets_failure_count():
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=60)
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.failures == 2
+
+
+def test_breaker_half_opens_for_one_probe():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+    # The reset timeout is over: one probe goes through, the rest wait for it
+    assert breaker.allow()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.allow()
+
+
+def test_successful_probe_closes_breaker():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+    assert breaker.allow()
+
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.failures == 0
+    assert breaker.allow()
+
+
+def test_failed_probe_reopens_breaker():
+    breaker = CircuitBreaker(failure_threshold=5, reset_timeout=0)
+    breaker.record_failure(open_for=0)
+    assert breaker.allow()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+
+    # A single failure while half-open is enough, whatever the threshold
+    breaker.reset_timeout = 60
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+
+
+def test_released_probe_lets_another_through():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+    assert breaker.allow()
+    assert not breaker.allow()
+
+    breaker.release_probe()
+    assert breaker.allow()
+
+
+def test_open_for_opens_right_away():
+    breaker = CircuitBreaker(failure_threshold=5, reset_timeout=0)
+    breaker.record_failure(open_for=60)
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+
+
+def test_retry_after_zero_allows_a_probe_at_once():
+    breaker = CircuitBreaker(failure_threshold=5, reset_timeout=60)
+    breaker.record_failure(open_for=0)
+    assert breaker.allow()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+
+
+def test_policy_stops_calling_a_failing_store():
+    policy = StorePolicy(rate=100, burst=100)
+    calls = []
+
+    def failing(isbn):
+        calls.append(isbn)
+        raise ConnectionError("store down")
+
+    for _ in range(policy.breaker.failure_threshold):
+        with pytest.raises(ConnectionError):
+            policy.call(failing, "9788478884452")
+    assert policy.breaker.state == CircuitBreaker.OPEN
+
+    with pytest.raises(StoreUnavailable):
+        policy.call(failing, "9788478884452")
+    assert len(calls) == policy.breaker.failure_threshold
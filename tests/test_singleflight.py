@@ -0,0 +1,121 @@
+import threading
+import time
+
+from src.engine import iter_search_isbn
+from src.singleflight import SingleFlight
+
+ISBN = "9788478884452"
+CALLERS = 10
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("timed out waiting")
+        time.sleep(0.001)
+
+
+def run_concurrently(target, n=CALLERS):
+    """Start `n` threads running `target(i)`; return the threads and their results by index."""
+    results = {}
+
+    def run(i):
+        try:
+            results[i] = target(i)
+        except Exception as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(n)]
+    for thread in threads:
+        thread.start()
+    return threads, results
+
+
+def test_concurrent_calls_share_one():
+    flights = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def lookup():
+        calls.append(1)
+        release.wait(5)
+        return {'price': "10,00 €"}
+
+    threads, results = run_concurrently(lambda i: flights.do("key", lookup))
+    # Everyone but the leader is waiting on its call before it finishes
+    wait_until(lambda: flights.coalesced == CALLERS - 1)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert flights.stats() == {"calls": 1, "coalesced": CALLERS - 1}
+    assert all(r is results[0] for r in results.values())
+    assert flights.in_flight() == 0
+
+
+def test_exception_is_shared():
+    flights = SingleFlight()
+    release = threading.Event()
+
+    def lookup():
+        release.wait(5)
+        raise ConnectionError("store down")
+
+    threads, results = run_concurrently(lambda i: flights.do("key", lookup))
+    wait_until(lambda: flights.coalesced == CALLERS - 1)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert all(isinstance(r, ConnectionError) for r in results.values())
+    assert flights.in_flight() == 0
+
+
+def test_key_is_released_after_the_call():
+    flights = SingleFlight()
+    assert flights.do("key", lambda: 1) == 1
+    assert flights.do("key", lambda: 2) == 2
+    assert flights.stats() == {"calls": 2, "coalesced": 0}
+
+
+def test_different_keys_run_separately():
+    flights = SingleFlight()
+    release = threading.Event()
+
+    def lookup(key):
+        release.wait(5)
+        return key
+
+    threads, results = run_concurrently(lambda i: flights.do(i, lookup, i), n=3)
+    wait_until(lambda: flights.in_flight() == 3)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert results == {0: 0, 1: 1, 2: 2}
+    assert flights.stats() == {"calls": 3, "coalesced": 0}
+
+
+def test_concurrent_searches_send_one_request_per_store():
+    flights = SingleFlight()
+    release = threading.Event()
+    requests = []
+
+    def scraper(isbn):
+        requests.append(isbn)
+        release.wait(5)
+        return {'title': "Harry Potter", 'price': "10,00 €"}
+
+    def search(i):
+        return list(iter_search_isbn(ISBN, {"Amazon": scraper}, flights=flights))
+
+    threads, results = run_concurrently(search, n=5)
+    wait_until(lambda: flights.coalesced == 4)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert requests == [ISBN]
+    assert all(r[0]['status'] == 'ok' for r in results.values())